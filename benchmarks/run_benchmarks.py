@@ -0,0 +1,221 @@
+""" Benchmarks of the hot paths of all the lists: wall time (best of <repeat> runs) and peak memory (tracemalloc,
+separate run) at several sizes. Results are saved as JSON and compared with a saved baseline.
+
+usage (from the root of the repository, offline):
+    python -m benchmarks.run_benchmarks --save-baseline          # measure and save benchmarks/results/baseline.json
+    python -m benchmarks.run_benchmarks                          # measure and compare with the baseline
+    python -m benchmarks.run_benchmarks --quick --filter q_voter --time-threshold 0.5
+
+Exit code is 1 if any benchmark is slower (or uses more memory) than the baseline by more than the threshold.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+
+import networkx as nx
+import numpy as np
+from matplotlib import pyplot as plt
+
+from list_2.models import Graph, Vertex, global_clustering, core_numbers, diameter_bounds
+from list_3.models import random_graph, watts_strogatz, barabasi_albert, to_csr
+from list_4.models import RandomWalk, PearsonRandomWalk, RandomWalkOnGraph
+from list_5.models import solver, sir_model, total_infected_vs_r0
+from list_6.models import QVoter
+
+RESULTS_FOLDER = os.path.join(os.path.dirname(__file__), 'results')
+SEED = 0
+
+
+def list_2_graph(n: int, weighted: bool = False) -> Graph:
+    """ function returning list_2 Graph of the erdos-renyi graph with mean degree 4. """
+    network = nx.gnp_random_graph(n, 4 / n, seed=SEED)
+    rng = np.random.default_rng(SEED)
+    graph = Graph()
+    vertices = [Vertex(id=node) for node in network.nodes]
+    graph.add_vertices_from_list(vertices)
+    for u, v in network.edges:
+        graph.add_edge(vertices[u], vertices[v], weight=int(rng.integers(1, 10)) if weighted else 1)
+    return graph
+
+
+def shortest_paths(n: int) -> callable:
+    graph = list_2_graph(n)
+    vertices = list(graph.vertices)
+
+    def run():
+        # get_shortest_paths removes visited vertices from graph.vertices
+        graph.vertices = list(vertices)
+        graph.get_shortest_paths(vertices[0])
+    return run
+
+
+def weighted_shortest_paths(n: int) -> callable:
+    graph = list_2_graph(n, weighted=True)
+    return lambda: graph.get_weighted_shortest_paths(graph.vertices[0])
+
+
+def network_metrics(n: int) -> callable:
+    csr = to_csr(nx.barabasi_albert_graph(n, 5, seed=SEED))
+
+    def run():
+        global_clustering(csr)
+        core_numbers(csr)
+        diameter_bounds(csr)
+    return run
+
+
+def q_voter(n: int) -> callable:
+    network = nx.barabasi_albert_graph(n, 4, seed=SEED)
+    return lambda: QVoter(network).simulate(num_of_events=10 * n, p=0.1, q=3)
+
+
+def random_walk_on_graph(n: int) -> callable:
+    walk = RandomWalkOnGraph(nx.barabasi_albert_graph(n, 4, seed=SEED))
+    return lambda: walk.get_stats(starting_node=0, max_iter=100 * n)
+
+
+def sir_solver(n: int) -> callable:
+    t = np.linspace(0, 100, n)
+    return lambda: solver(sir_model, (999, 1, 0), t, r=0.1, beta=0.0005)
+
+
+def sir_total_infected(n: int) -> callable:
+    t = np.linspace(0, 100, 1000)
+    S0, I0, R0 = (999,) * n, (1,) * n, (0,) * n
+    r, beta = tuple(np.linspace(0.05, 0.5, n)), tuple(np.linspace(1e-4, 1e-3, n))
+
+    def run():
+        total_infected_vs_r0(t, S0, I0, R0, r, beta)
+        plt.close('all')
+    return run
+
+
+# name: (function returning the benchmarked callable for a size, sizes, quick sizes)
+BENCHMARKS = {
+    'list_2.get_shortest_paths': (shortest_paths, [100, 300, 1000], [100]),
+    'list_2.get_weighted_shortest_paths': (weighted_shortest_paths, [100, 300, 1000], [100]),
+    'list_2.metrics': (network_metrics, [1000, 10000, 100000], [1000]),
+    'list_3.random_graph': (lambda n: lambda: random_graph(n, 4 / n), [100, 300, 1000], [100]),
+    'list_3.watts_strogatz': (lambda n: lambda: watts_strogatz(n, 4, 0.1), [100, 1000, 10000], [100]),
+    'list_3.barabasi_albert': (lambda n: lambda: barabasi_albert(n, 4), [100, 1000, 10000], [100]),
+    'list_4.RandomWalk.generate': (lambda n: lambda: RandomWalk().generate(num_of_steps=n), [1000, 10000, 100000],
+                                   [1000]),
+    'list_4.PearsonRandomWalk.get_stats': (lambda n: lambda: PearsonRandomWalk().get_stats(10, num_of_steps=n),
+                                           [100, 1000, 10000], [100]),
+    'list_4.RandomWalkOnGraph.get_stats': (random_walk_on_graph, [100, 300, 1000], [100]),
+    'list_5.solver': (sir_solver, [1000, 10000, 100000], [1000]),
+    'list_5.total_infected_vs_r0': (sir_total_infected, [10, 100, 1000], [10]),
+    'list_6.QVoter.simulate': (q_voter, [100, 300, 1000], [100]),
+}
+
+
+def measure(make_run: callable, size: int, repeat: int) -> dict:
+    """ function returning best wall time [s] of <repeat> runs and peak traced memory [B] of one more run. """
+    run = make_run(size)
+
+    times = []
+    for _ in range(repeat):
+        np.random.seed(SEED)
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    np.random.seed(SEED)
+    gc.collect()
+    tracemalloc.start()
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {'time': min(times), 'peak_memory': peak_memory}
+
+
+def run_benchmarks(names: list[str], quick: bool = False, repeat: int = 3) -> dict:
+    """ function running the benchmarks <names>.
+    Returns:
+        (dict): {'meta': {...}, 'results': {name: {size: {'time': ..., 'peak_memory': ...}}}}
+    """
+    results = {}
+    for name in names:
+        make_run, sizes, quick_sizes = BENCHMARKS[name]
+        results[name] = {}
+        for size in quick_sizes if quick else sizes:
+            try:
+                result = measure(make_run, size, repeat)
+            except Exception as error:
+                # broken benchmark is reported, the rest of the suite still runs
+                results[name][str(size)] = {'error': repr(error)}
+                print(f'{name:40} n={size:<8} ERROR {error!r}')
+                continue
+            results[name][str(size)] = result
+            print(f'{name:40} n={size:<8} {result["time"]:10.4f} s {result["peak_memory"] / 2 ** 20:10.2f} MiB')
+
+    meta = {'date': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'networkx': nx.__version__, 'machine': platform.machine(),
+            'processor': platform.processor(), 'quick': quick, 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def compare(current: dict, baseline: dict, time_threshold: float = 0.2, memory_threshold: float = 0.2) -> list[str]:
+    """ function returning regressions of <current> results against <baseline> - relative increase of time or peak
+        memory bigger than the thresholds (benchmarks or sizes missing in any of them are skipped). """
+    regressions = []
+    for name, sizes in current['results'].items():
+        for size, result in sizes.items():
+            reference = baseline['results'].get(name, {}).get(size)
+            if reference is None or 'error' in reference:
+                continue
+            if 'error' in result:
+                regressions.append(f'{name} n={size}: {result["error"]}')
+                continue
+            for key, threshold in (('time', time_threshold), ('peak_memory', memory_threshold)):
+                if reference[key] > 0 and result[key] > (1 + threshold) * reference[key]:
+                    regressions.append(f'{name} n={size}: {key} {result[key]:.4g} vs baseline {reference[key]:.4g} '
+                                       f'(+{result[key] / reference[key] - 1:.0%})')
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='benchmarks of the hot paths with regression check')
+    parser.add_argument('--filter', default='', help='run only benchmarks with this substring in the name')
+    parser.add_argument('--quick', action='store_true', help='only the smallest sizes')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs (best is reported)')
+    parser.add_argument('--output', default=os.path.join(RESULTS_FOLDER, 'latest.json'))
+    parser.add_argument('--baseline', default=os.path.join(RESULTS_FOLDER, 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true', help='save the results as the new baseline')
+    parser.add_argument('--time-threshold', type=float, default=0.2, help='allowed relative increase of time')
+    parser.add_argument('--memory-threshold', type=float, default=0.2, help='allowed relative increase of memory')
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    current = run_benchmarks(names, quick=args.quick, repeat=args.repeat)
+
+    path = args.baseline if args.save_baseline else args.output
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as file:
+        json.dump(current, file, indent=2)
+    print(f'results saved to {path}')
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(current, baseline, args.time_threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    print(f'{len(regressions)} regressions against {args.baseline}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
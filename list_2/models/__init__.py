@@ -1,12 +1,22 @@
 from .vertex import Vertex
 from .edge import Edge
 from .graph import Graph
+from .metrics import (simple_csr, triangles, local_clustering, global_clustering, degree_assortativity,
+                      core_numbers, eccentricity, diameter_bounds)
 
 
 __all__ = [
     Graph,
     Vertex,
-    Edge
+    Edge,
+    simple_csr,
+    triangles,
+    local_clustering,
+    global_clustering,
+    degree_assortativity,
+    core_numbers,
+    eccentricity,
+    diameter_bounds
 ]
 
 
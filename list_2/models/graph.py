@@ -95,7 +95,25 @@ class Graph:
                 weighted_neighbours.append((edge.to_vert, edge.weight))
             elif edge.to_vert == vert_key:
                 weighted_neighbours.append((edge.from_vert, edge.weight))
-            return weighted_neighbours
+        return weighted_neighbours
+
+    def to_csr(self) -> tuple[list, np.array, np.array]:
+        """ method returning CSR adjacency of the graph (one pass over the edges), e.g. for SharedTopology.
+        Returns:
+            (tuple[list, np.array, np.array]): list of vertex ids, indptr and indices - positions (in the list of
+                                               vertex ids) of the neighbours of i-th vertex are
+                                               indices[indptr[i]:indptr[i + 1]]
+        """
+        position = {vertex.id: i for i, vertex in enumerate(self.vertices)}
+        sources = [position[edge.from_vert.id] for edge in self.edges]
+        targets = [position[edge.to_vert.id] for edge in self.edges]
+
+        # every edge is a neighbourhood of both its ends, as in get_neighbours
+        rows = np.array(sources + targets, dtype=np.int64)
+        columns = np.array(targets + sources, dtype=np.int32)
+        order = np.argsort(rows, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(self.vertices)))]).astype(np.int64)
+        return [vertex.id for vertex in self.vertices], indptr, columns[order]
 
     def __contains__(self, vertex: Vertex) -> bool:
         """ method checking if the given Vertex is in the graph.
@@ -183,6 +201,10 @@ class Graph:
             # take first node from the queue
             node, path_weight = neighbours_weighted.pop(0)
 
+            # skip outdated entries - shorter path has been found after they were queued
+            if path_weight >= shortest_path[node.id]:
+                continue
+
             # save the path weight to result list
             shortest_path[node.id] = path_weight
 
@@ -191,7 +213,7 @@ class Graph:
                               neighbour in self.get_weighted_neighbours(node)]
 
             # add only these neighbours with shorter path than already existing
-            neighbours_to_queue = [it for it in new_neighbours if it[1] < shortest_path[it[0]]]
+            neighbours_to_queue = [it for it in new_neighbours if it[1] < shortest_path[it[0].id]]
 
             # add new neighbours to the queue
             neighbours_weighted.extend(neighbours_to_queue)
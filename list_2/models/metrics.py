@@ -0,0 +1,263 @@
+import numpy as np
+
+# maximal number of wedges (pairs of forward edges) checked at once in triangle counting
+WEDGE_CHUNK = 2 ** 22
+
+
+def simple_csr(graph) -> tuple[list, np.ndarray, np.ndarray]:
+    """ function returning CSR adjacency of the simple undirected graph - without self-loops and multiple edges,
+        neighbours sorted by position.
+    Args:
+        graph (Graph | tuple): list_2 Graph (or any object with to_csr(), or with nodes, indptr and indices
+                               attributes as SharedTopology) or CSR tuple (nodes, indptr, indices).
+    Returns:
+        (tuple[list, np.ndarray, np.ndarray]): list of nodes, indptr and indices - positions (in the list of nodes) of
+                                               the neighbours of nodes[i] are indices[indptr[i]:indptr[i + 1]]
+    """
+    if hasattr(graph, 'to_csr'):
+        nodes, indptr, indices = graph.to_csr()
+    elif hasattr(graph, 'indptr'):
+        nodes, indptr, indices = graph.nodes, graph.indptr, graph.indices
+    else:
+        nodes, indptr, indices = graph
+
+    n = len(nodes)
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    columns = np.asarray(indices, dtype=np.int64)
+    # both directions of every edge, so the adjacency stays symmetric after removing duplicates
+    keys = np.sort(np.concatenate([rows * n + columns, columns * n + rows]))
+    # sort and mask instead of np.unique (its hash table is several times slower on millions of keys)
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+    rows, columns = np.divmod(keys, n)
+    loops = rows == columns
+    rows, columns = rows[~loops], columns[~loops]
+
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))]).astype(np.int64)
+    return list(nodes), indptr, columns.astype(np.int32)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, sources: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """ function returning concatenated neighbourhoods of <sources> and the source of each of the neighbours. """
+    starts, degrees = indptr[sources], indptr[sources + 1] - indptr[sources]
+    total = int(degrees.sum())
+    owners = np.repeat(np.arange(len(sources)), degrees)
+    offsets = np.arange(total) - np.repeat(np.cumsum(degrees) - degrees, degrees)
+    return indices[np.repeat(starts, degrees) + offsets], sources[owners]
+
+
+def triangles(graph) -> tuple[int, np.ndarray]:
+    """ function counting triangles by forward edges: nodes are ranked by degree, every edge is directed to the node
+        of the higher rank and each pair of forward edges of a node (wedge) is closed if the forward edge between its
+        ends exists. Every triangle is found exactly once and out-degrees are at most sqrt(2 * edges), so the time is
+        O(edges ** 1.5) in the worst case (near-linear for sparse graphs); wedges are checked in vectorized chunks.
+    Args:
+        graph (Graph | tuple): graph (see simple_csr).
+    Returns:
+        (tuple[int, np.ndarray]): number of triangles in the graph and number of triangles of each node (ordered as the
+                                  nodes of simple_csr).
+    """
+    nodes, indptr, indices = simple_csr(graph)
+    n = len(nodes)
+    degrees = np.diff(indptr)
+
+    # rank of the nodes by (degree, position)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.lexsort((np.arange(n), degrees))] = np.arange(n)
+
+    rows = np.repeat(np.arange(n, dtype=np.int64), degrees)
+    forward = rank[indices] > rank[rows]
+    sources, targets = rank[rows[forward]], rank[indices[forward]]
+    order = np.lexsort((targets, sources))
+    sources, targets = sources[order], targets[order]
+    keys = sources * n + targets
+
+    # forward edges of every source are sorted, so the pairs of its edges (i, j > i) are wedges with targets ordered
+    source_pointer = np.searchsorted(sources, np.arange(n + 1))
+    pairs = (source_pointer[sources + 1] - 1 - np.arange(len(sources)))
+    bounds = np.concatenate([[0], np.cumsum(pairs)])
+
+    counts = np.zeros(n, dtype=np.int64)
+    total, start = 0, 0
+    while start < len(sources):
+        # edges whose wedges fit in the chunk (at least one edge to make progress)
+        stop = max(int(np.searchsorted(bounds, bounds[start] + WEDGE_CHUNK, side='right')) - 1, start + 1)
+        first = np.repeat(np.arange(start, stop), pairs[start:stop])
+        second = first + 1 + np.arange(len(first)) - np.repeat(bounds[start:stop] - bounds[start], pairs[start:stop])
+
+        closing = targets[first] * n + targets[second]
+        position = np.minimum(np.searchsorted(keys, closing), len(keys) - 1)
+        closed = keys[position] == closing if len(keys) else np.zeros(len(closing), dtype=bool)
+
+        total += int(closed.sum())
+        for corner in (sources[first[closed]], targets[first[closed]], targets[second[closed]]):
+            counts += np.bincount(corner, minlength=n)
+        start = stop
+
+    # back from ranks to positions
+    return total, counts[rank]
+
+
+def local_clustering(graph) -> np.ndarray:
+    """ function returning local clustering coefficient of each node - fraction of closed pairs of its neighbours
+        (0 for nodes with degree < 2), ordered as the nodes of simple_csr. """
+    nodes, indptr, indices = simple_csr(graph)
+    degrees = np.diff(indptr)
+    _, counts = triangles((nodes, indptr, indices))
+    pairs = degrees * (degrees - 1) / 2
+    return np.divide(counts, pairs, out=np.zeros(len(nodes)), where=pairs > 0)
+
+
+def global_clustering(graph) -> dict:
+    """ function returning global clustering coefficients of the graph.
+    Args:
+        graph (Graph | tuple): graph (see simple_csr).
+    Returns:
+        (dict): 'transitivity' - 3 * triangles / connected triples, 'average_clustering' - mean of local clustering
+                coefficients (as in Gephi), 'triangles' - number of triangles.
+    """
+    nodes, indptr, indices = simple_csr(graph)
+    degrees = np.diff(indptr)
+    total, counts = triangles((nodes, indptr, indices))
+    pairs = degrees * (degrees - 1) / 2
+    local = np.divide(counts, pairs, out=np.zeros(len(nodes)), where=pairs > 0)
+    return {'transitivity': 3 * total / pairs.sum() if pairs.sum() else 0.,
+            'average_clustering': float(local.mean()) if len(nodes) else 0.,
+            'triangles': total}
+
+
+def degree_assortativity(graph) -> float:
+    """ function returning degree assortativity (Pearson correlation of degrees of the ends of the edges, Newman 2002);
+        nan if all the edges join nodes of the same degree. """
+    nodes, indptr, indices = simple_csr(graph)
+    degrees = np.diff(indptr).astype(np.float64)
+    # every edge in both directions, so the correlation is symmetric
+    ends = degrees[indices]
+    starts = np.repeat(degrees, np.diff(indptr))
+    if not len(ends):
+        return float('nan')
+    mean = ends.mean()
+    variance = np.mean(ends ** 2) - mean ** 2
+    if variance <= 0:
+        return float('nan')
+    return float((np.mean(starts * ends) - mean ** 2) / variance)
+
+
+def core_numbers(graph) -> np.ndarray:
+    """ function returning core number of each node (the largest k such that the node belongs to the k-core) by the
+        bucket queue algorithm of Batagelj and Zaversnik - nodes sorted by degree are removed from the lowest bucket
+        and their neighbours are moved one bucket down in O(1), O(nodes + edges) in total.
+    Args:
+        graph (Graph | tuple): graph (see simple_csr).
+    Returns:
+        (np.ndarray): core numbers ordered as the nodes of simple_csr.
+    """
+    nodes, indptr, indices = simple_csr(graph)
+    n = len(nodes)
+    degree = np.diff(indptr).tolist()
+    indptr, indices = indptr.tolist(), indices.tolist()
+
+    # bucket queue: nodes sorted by current degree, <start[d]> is the first position of degree d
+    order = sorted(range(n), key=degree.__getitem__)
+    position = [0] * n
+    for i, node in enumerate(order):
+        position[node] = i
+    start = [0] * (max(degree, default=0) + 2)
+    for d in degree:
+        start[d + 1] += 1
+    for d in range(1, len(start)):
+        start[d] += start[d - 1]
+
+    for i in range(n):
+        node = order[i]
+        node_degree = degree[node]
+        for neighbour in indices[indptr[node]:indptr[node + 1]]:
+            neighbour_degree = degree[neighbour]
+            if neighbour_degree > node_degree:
+                # swap the neighbour with the first node of its bucket and shrink the bucket
+                first = start[neighbour_degree]
+                other = order[first]
+                if other != neighbour:
+                    order[first], order[position[neighbour]] = neighbour, other
+                    position[other], position[neighbour] = position[neighbour], first
+                start[neighbour_degree] += 1
+                degree[neighbour] = neighbour_degree - 1
+
+    return np.array(degree, dtype=np.int64)
+
+
+def _bfs(indptr: np.ndarray, indices: np.ndarray, source: int) -> tuple[np.ndarray, np.ndarray]:
+    """ level-synchronous breadth-first search - whole frontier expanded with array operations.
+    Returns:
+        (tuple[np.ndarray, np.ndarray]): distances from <source> (-1 for unreachable nodes) and parents in the tree.
+    """
+    distances = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    parents = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    slots = np.empty(len(indptr) - 1, dtype=np.int64)
+    distances[source] = 0
+    frontier, level = np.array([source], dtype=np.int64), 0
+    while len(frontier):
+        level += 1
+        neighbours, owners = _gather(indptr, indices, frontier)
+        new = distances[neighbours] < 0
+        neighbours, owners = neighbours[new], owners[new]
+        # one occurrence of each newly reached node (the last write of the scatter wins) without sorting
+        slots[neighbours] = np.arange(len(neighbours))
+        unique = slots[neighbours] == np.arange(len(neighbours))
+        frontier = neighbours[unique].astype(np.int64)
+        distances[frontier] = level
+        parents[frontier] = owners[unique]
+    return distances, parents
+
+
+def eccentricity(graph, node=None) -> int | np.ndarray:
+    """ function returning eccentricity (the largest distance within its connected component) of <node> - one BFS, or
+        of all the nodes if <node> is None - one BFS per node, O(nodes * edges), only for small graphs.
+    Args:
+        graph (Graph | tuple): graph (see simple_csr).
+        node: id of the node (element of the list of nodes). Defaults to None.
+    """
+    nodes, indptr, indices = simple_csr(graph)
+    if node is not None:
+        return int(_bfs(indptr, indices, nodes.index(node))[0].max())
+    return np.array([_bfs(indptr, indices, source)[0].max() for source in range(len(nodes))], dtype=np.int64)
+
+
+def diameter_bounds(graph, node=None, sweeps: int = 4) -> tuple[int, int]:
+    """ function returning bounds of the diameter of the connected component of <node> by double-sweep BFS: BFS from
+        a node finds the farthest node a, BFS from a finds the farthest b - d(a, b) is the lower bound. Eccentricity of
+        the middle node m of the path a-b gives the upper bound 2 * ecc(m). Next sweeps start from the farthest node of
+        the previous one, stopping early when the bounds meet. Each sweep is O(edges); only lower <= diameter <= upper
+        is guaranteed, the bounds may stay apart (e.g. (5, 6) on a path of 6 nodes).
+    Args:
+        graph (Graph | tuple): graph (see simple_csr).
+        node: id of the starting node. Defaults to None - the node of the highest degree.
+        sweeps (int): number of double sweeps. Defaults to 4.
+    Returns:
+        (tuple[int, int]): lower and upper bound of the diameter.
+    """
+    nodes, indptr, indices = simple_csr(graph)
+    if not nodes:
+        return 0, 0
+    source = nodes.index(node) if node is not None else int(np.argmax(np.diff(indptr)))
+
+    lower, upper = 0, np.inf
+    for _ in range(sweeps):
+        distances, _ = _bfs(indptr, indices, source)
+        upper = min(upper, 2 * int(distances.max()))
+        a = int(np.argmax(distances))
+
+        distances, parents = _bfs(indptr, indices, a)
+        b = int(np.argmax(distances))
+        lower = max(lower, int(distances[b]))
+
+        # middle of the path a-b
+        middle = b
+        for _ in range(distances[b] // 2):
+            middle = parents[middle]
+        middle_distances, _ = _bfs(indptr, indices, int(middle))
+        upper = min(upper, 2 * int(middle_distances.max()))
+
+        if lower == upper:
+            break
+        source = b
+    return lower, int(upper)
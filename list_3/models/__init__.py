@@ -1,6 +1,10 @@
 from .graphs import random_graph, barabasi_albert, watts_strogatz
 from .plots import pdf_emp, cdf_emp, dist_pdf_plot, dist_cdf_plot, show_degree_distribution
-from .utils import random_triangular, show_statistics
+from .utils import random_triangular, show_statistics, to_csr
+from .convergence import ConvergenceMonitor
+from .shared_topology import SharedTopology
+from .profiling import Profile, profiling, phase, count
+from .cache import DiskCache
 
 __all__ = [
     random_graph,
@@ -8,6 +12,14 @@ __all__ = [
     watts_strogatz,
     random_triangular,
     show_statistics,
+    to_csr,
+    ConvergenceMonitor,
+    SharedTopology,
+    Profile,
+    profiling,
+    phase,
+    count,
+    DiskCache,
     pdf_emp,
     cdf_emp,
     dist_cdf_plot,
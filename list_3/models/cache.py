@@ -0,0 +1,343 @@
+import functools
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import random
+import sys
+import sysconfig
+import tempfile
+import types
+
+import networkx as nx
+import numpy as np
+
+from list_3.models.profiling import count
+
+try:
+    import fcntl
+except ImportError:
+    # no inter-process lock of the eviction (e.g. windows) - files are still written and removed atomically
+    fcntl = None
+
+_ARRAY, _GRAPH, _PICKLE = b'A', b'G', b'P'
+_missing = object()
+
+
+def _scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _code_fingerprint(code: types.CodeType) -> str:
+    """ function returning hash of the bytecode, constants (nested functions included) and names of <code>. """
+    constants = [_code_fingerprint(constant) if isinstance(constant, types.CodeType) else repr(constant)
+                 for constant in code.co_consts]
+    return hashlib.sha256(repr((code.co_code, constants, code.co_names)).encode()).hexdigest()
+
+
+# installed packages and the standard library - their functions are described by name and version, not by code
+_LIBRARY_PATHS = tuple({os.path.realpath(path) for name, path in sysconfig.get_paths().items()
+                        if name in ('stdlib', 'platstdlib', 'purelib', 'platlib')})
+
+
+def _is_library(function) -> bool:
+    try:
+        path = os.path.realpath(inspect.getsourcefile(function))
+    except TypeError:
+        # compiled (builtin) functions and classes
+        return True
+    return any(path.startswith(library + os.sep) for library in _LIBRARY_PATHS)
+
+
+def _library_fingerprint(value) -> str:
+    """ function returning module.qualname of library function or class and the version of its package. """
+    module = getattr(value, '__module__', None) or ''
+    package = sys.modules.get(module.partition('.')[0])
+    version = getattr(package, '__version__', None) or sys.version.split()[0]
+    return f'{module}.{getattr(value, "__qualname__", getattr(value, "__name__", ""))}=={version}'
+
+
+def _function_fingerprint(function: types.FunctionType, active: set) -> str:
+    """ function returning text describing python function by its code, defaults and closure - lambdas and closures
+        sharing the qualified name are different functions. Decorated functions are described by the wrapped one,
+        functions of installed packages by name and version (their defaults may refer back to the function, e.g.
+        networkx argmap wrappers). """
+    function = inspect.unwrap(function)
+    if not isinstance(function, types.FunctionType) or _is_library(function):
+        return _library_fingerprint(function)
+
+    closure = [_fingerprint(cell.cell_contents, active) if _has_contents(cell) else 'empty'
+               for cell in function.__closure__ or ()]
+    return (f'{function.__module__}.{function.__qualname__}({_code_fingerprint(function.__code__)},'
+            f'{_fingerprint(function.__defaults__, active)},{_fingerprint(function.__kwdefaults__, active)},'
+            f'{",".join(closure)})')
+
+
+def _has_contents(cell) -> bool:
+    try:
+        cell.cell_contents
+    except ValueError:
+        return False
+    return True
+
+
+def _fingerprint(value, active: set | None = None) -> str:
+    """ function returning text uniquely describing <value> (content, not identity) for the key of the cache.
+        Raises TypeError for objects described only by identity (no cache_key method and not plain data), as their
+        repr changes between runs, and for objects referring to themselves. <active> - ids of the objects being
+        described (cycle detection). """
+    value = _scalar(value)
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+
+    active = set() if active is None else active
+    if id(value) in active:
+        raise TypeError(f'{type(value).__qualname__} object refers to itself and cannot be a part of the cache key')
+    active.add(id(value))
+    try:
+        return _describe(value, active)
+    finally:
+        active.discard(id(value))
+
+
+def _describe(value, active: set) -> str:
+    """ function returning description of not plain <value> (see _fingerprint). """
+    if hasattr(value, 'cache_key'):
+        return f'{type(value).__qualname__}({_fingerprint(value.cache_key(), active)})'
+    if isinstance(value, np.ndarray):
+        return f'ndarray({value.dtype},{value.shape},{hashlib.sha256(np.ascontiguousarray(value)).hexdigest()})'
+    if isinstance(value, nx.Graph):
+        # numpy scalars (e.g. edges added from np.nonzero) are the same nodes as python ones
+        nodes = sorted(repr((_scalar(node), data)) for node, data in value.nodes(data=True))
+        edges = sorted(repr((tuple(sorted(repr(_scalar(node)) for node in (u, v))), data))
+                       for u, v, data in value.edges(data=True))
+        return f'{type(value).__name__}({hashlib.sha256(repr((nodes, edges)).encode()).hexdigest()})'
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}({",".join(_fingerprint(item, active) for item in value)})'
+    if isinstance(value, (set, frozenset)):
+        return f'{type(value).__name__}({",".join(sorted(_fingerprint(item, active) for item in value))})'
+    if isinstance(value, dict):
+        items = sorted(f'{_fingerprint(k, active)}:{_fingerprint(v, active)}' for k, v in value.items())
+        return f'dict({",".join(items)})'
+    if isinstance(value, types.FunctionType):
+        return _function_fingerprint(value, active)
+    if isinstance(value, types.MethodType):
+        return f'{_fingerprint(value.__self__, active)}.{_fingerprint(value.__func__, active)}'
+    if isinstance(value, functools.partial):
+        return (f'partial({_fingerprint(value.func, active)},{_fingerprint(value.args, active)},'
+                f'{_fingerprint(value.keywords, active)})')
+    if isinstance(value, types.ModuleType):
+        return f'module({value.__name__})'
+    if isinstance(value, (type, types.BuiltinFunctionType, np.ufunc)):
+        # classes and compiled functions are described by the name and the version of their package
+        return _library_fingerprint(value)
+    if callable(value) and hasattr(value, '__wrapped__'):
+        # callable objects of decorators (e.g. networkx argmap)
+        return _fingerprint(inspect.unwrap(value), active)
+    raise TypeError(f'{type(value).__qualname__} object cannot be a part of the cache key - define cache_key() '
+                    f'returning its content')
+
+
+@functools.lru_cache(maxsize=None)
+def _source_version(path: str, mtime: float) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def code_version(function: callable) -> str:
+    """ function returning hash of the source file of <function> - any change of the module invalidates the cached
+        results of its functions. """
+    function = inspect.unwrap(getattr(function, '__func__', function))
+    try:
+        path = inspect.getsourcefile(function)
+        return _source_version(path, os.path.getmtime(path))
+    except (TypeError, OSError):
+        # builtins and functions without source
+        return getattr(function, '__module__', '') or ''
+
+
+def _is_plain_graph(value) -> bool:
+    """ undirected simple graph with integer nodes and no attributes can be stored as arrays. """
+    return (type(value) is nx.Graph and not value.graph and all(isinstance(node, int) for node in value)
+            and not any(data for _, data in value.nodes(data=True))
+            and not any(data for _, _, data in value.edges(data=True)))
+
+
+def _dumps(value) -> bytes:
+    buffer = io.BytesIO()
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        buffer.write(_ARRAY)
+        np.save(buffer, value, allow_pickle=False)
+    elif isinstance(value, nx.Graph) and _is_plain_graph(value):
+        buffer.write(_GRAPH)
+        np.savez_compressed(buffer, nodes=np.fromiter(value.nodes, dtype=np.int64, count=len(value)),
+                            edges=np.array(list(value.edges), dtype=np.int64).reshape(-1, 2))
+    else:
+        buffer.write(_PICKLE)
+        pickle.dump(value, buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    return buffer.getvalue()
+
+
+def _loads(data: bytes):
+    kind, buffer = data[:1], io.BytesIO(data[1:])
+    if kind == _ARRAY:
+        return np.load(buffer, allow_pickle=False)
+    if kind == _GRAPH:
+        with np.load(buffer) as arrays:
+            graph = nx.Graph()
+            graph.add_nodes_from(arrays['nodes'].tolist())
+            graph.add_edges_from(arrays['edges'].tolist())
+            return graph
+    return pickle.loads(data[1:])
+
+
+class DiskCache:
+    """ Content-addressed on-disk memoization of generated graphs and simulation results.
+
+    The key is sha256 of the function, its arguments (by content - arrays and graphs are hashed), the seed and the
+    version of the code (hash of the source file of the function). Arrays are stored with np.save, plain integer
+    graphs as compressed edge arrays, anything else is pickled.
+
+    Files are written to a temporary file and renamed, so processes sharing the folder never read partial results.
+    Access time of a hit is recorded in the file mtime; when the folder grows over <max_size> bytes the least
+    recently used results are removed (under a file lock, so concurrent processes do not evict twice).
+
+    Random functions (using np.random / random global generators, as the list_3 generators and QVoter) are cached
+    only when a seed is given: the generators are seeded for the call and their previous state is restored, so the
+    caller sees the same random stream for a hit and a miss.
+
+    Attributes:
+        folder (str): folder of the cache. Defaults to ~/.cache/diffusion_processes.
+        max_size (int): maximal total size of the results in bytes. Defaults to 1 GiB.
+    Example:
+        cache = DiskCache()
+        graph = cache.call(barabasi_albert, 100, 4, seed=0)
+        magnetization = cache.call(QVoter(graph).simulate, 1000, 0.1, 3, seed=1)
+        solution = cache.call(solver, sir_model, (999, 1, 0), t, 0.1, 0.0005, deterministic=True)
+    """
+
+    def __init__(self, folder: str | None = None, max_size: int = 2 ** 30):
+        self.folder = folder or os.path.join(os.path.expanduser('~'), '.cache', 'diffusion_processes')
+        self.max_size = max_size
+        os.makedirs(self.folder, exist_ok=True)
+
+    def key(self, function: callable, args: tuple, kwargs: dict, seed: int | None = None) -> str:
+        """ method returning the key of the call of <function> (TypeError if any of the arguments or the instance of
+            the method has no content based description, see _fingerprint). """
+        description = (_fingerprint(getattr(function, '__self__', None)), _fingerprint(function),
+                       code_version(function), _fingerprint(args), _fingerprint(kwargs), _fingerprint(seed))
+        return hashlib.sha256(repr(description).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, f'{key}.bin')
+
+    def get(self, key: str, default=None):
+        """ method returning cached value of <key> (or <default>) and marking it as recently used. """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # never computed or evicted by another process
+            return default
+        return _loads(data)
+
+    def set(self, key: str, value) -> None:
+        """ method storing <value> under <key> atomically and evicting least recently used results if needed. """
+        descriptor, temporary_path = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(_dumps(value))
+        os.replace(temporary_path, self._path(key))
+        self.evict()
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def size(self) -> int:
+        """ method returning total size of the stored results in bytes. """
+        return sum(entry.stat().st_size for entry in os.scandir(self.folder) if entry.name.endswith('.bin'))
+
+    def evict(self) -> None:
+        """ method removing least recently used results until the cache fits in <max_size>. """
+        with open(os.path.join(self.folder, '.lock'), 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            entries = []
+            for entry in os.scandir(self.folder):
+                if entry.name.endswith('.bin'):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                    count('cache.evictions')
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self) -> None:
+        """ method removing all the stored results. """
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith('.bin'):
+                os.remove(entry.path)
+
+    def call(self, function: callable, *args, seed: int | None = None, deterministic: bool = False, **kwargs):
+        """ method returning cached result of function(*args, **kwargs) (computing and storing it on a miss).
+        Args:
+            function (callable): function or bound method, e.g. QVoter(network).simulate.
+            *args: arguments of the function.
+            seed (int | None): seed of np.random and random for the call. Defaults to None.
+            deterministic (bool): True if the result does not depend on the random generators. Defaults to False,
+                                  i.e. the result is cached only if <seed> is given.
+            **kwargs: keyword arguments of the function.
+        Bound methods of objects without cache_key() (e.g. FastQVoter keeping its own generator) and such arguments
+        raise TypeError instead of being keyed by their identity.
+        """
+        if seed is None and not deterministic:
+            count('cache.uncacheable')
+            return function(*args, **kwargs)
+
+        key = self.key(function, args, kwargs, seed)
+        value = self.get(key, default=_missing)
+        if value is not _missing:
+            count('cache.hits')
+            return value
+
+        count('cache.misses')
+        if seed is None:
+            value = function(*args, **kwargs)
+        else:
+            numpy_state, random_state = np.random.get_state(), random.getstate()
+            np.random.seed(seed)
+            random.seed(seed)
+            try:
+                value = function(*args, **kwargs)
+            finally:
+                np.random.set_state(numpy_state)
+                random.setstate(random_state)
+
+        self.set(key, value)
+        return value
+
+    def memoize(self, function: callable = None, *, deterministic: bool = False):
+        """ decorator caching results of <function>; the decorated function accepts additional <seed> keyword
+            argument (see call). """
+        if function is None:
+            return functools.partial(self.memoize, deterministic=deterministic)
+
+        @functools.wraps(function)
+        def wrapper(*args, seed: int | None = None, **kwargs):
+            return self.call(function, *args, seed=seed, deterministic=deterministic, **kwargs)
+
+        return wrapper
+
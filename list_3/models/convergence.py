@@ -0,0 +1,141 @@
+import numpy as np
+
+
+class ConvergenceMonitor:
+    """ Monitor of a scalar observable of a simulation (e.g. magnetization) detecting absorption or equilibration,
+    so the run can be stopped early. Monotonic observables (e.g. fraction of visited nodes of a walk) never
+    equilibrate - their plateaus would pass the test.
+
+    Every <every>-th value is recorded. The run is absorbed when, after at least <min_samples> recorded values, the
+    recorded value is one of <absorbing> values and some earlier value was not - a run starting in the absorbing
+    state (e.g. QVoter starts at magnetization 1) is not stopped immediately.
+    Equilibration is checked with batch means after every <check_every> recorded values. The first half of the
+    samples is discarded as burn-in and the second half is split into <batches> batches. The run is equilibrated when
+    - the mean of the first 10% of the samples agrees with the mean of the last 50% within <z> standard errors
+      (Geweke test - a run still relaxing from its initial state differs between the windows),
+    - the batches are at least <tau_factor> autocorrelation times long (otherwise the batch means are correlated
+      and their standard error is underestimated),
+    - standard error of the mean is not bigger than <tolerance>.
+
+    Integrated autocorrelation time is estimated from the same batches: tau = b * var(batch means) / var(samples)
+    (b - size of the batch), effective sample size is the number of samples after burn-in divided by tau.
+
+    Consecutive events of a simulation are strongly correlated - record the observable once per Monte Carlo sweep
+    (<every> = N events). QVoter and FastQVoter set it so if <every> is not given.
+
+    Attributes:
+        tolerance (float): maximal standard error of the mean. Defaults to 0.01.
+        batches (int): number of batches. Defaults to 20.
+        z (float): number of standard errors allowed between the early and the late window. Defaults to 2.
+        tau_factor (float): minimal size of the batch in autocorrelation times. Defaults to 10.
+        min_samples (int): number of recorded values before the first check. Defaults to 1000.
+        check_every (int): number of recorded values between checks. Defaults to 100.
+        every (int | None): recording interval in values (e.g. N events = one Monte Carlo sweep). Defaults to None,
+                            i.e. set by the simulation (1 if it does not set it).
+        absorbing (tuple): absorbing values of the observable, e.g. (-1, 1) for consensus of the q-voter model with
+                           p = 0 only (for p > 0 independence leaves the consensus). Defaults to ().
+    """
+
+    def __init__(self, tolerance: float = 0.01, batches: int = 20, z: float = 2., min_samples: int = 1000,
+                 check_every: int = 100, every: int | None = None, absorbing: tuple = (), tau_factor: float = 10.):
+        if batches < 2:
+            raise ValueError("number of batches has to be at least 2")
+        self.tolerance = tolerance
+        self.batches = batches
+        self.z = z
+        self.tau_factor = tau_factor
+        self.min_samples = min_samples
+        self.check_every = check_every
+        self.every = every
+        self.absorbing = tuple(absorbing)
+
+        self.samples = []
+        self.num_of_values = 0
+        self.reason = None
+        # True once a recorded value was outside the absorbing states
+        self._left = False
+        self._next_check = max(min_samples, 1)
+
+    @property
+    def converged(self) -> bool:
+        return self.reason is not None
+
+    def update(self, values: float | np.ndarray) -> bool:
+        """ method recording a value (or a block of consecutive values) of the observable.
+        Args:
+            values (float | np.ndarray): value(s) of the observable.
+        Returns:
+            (bool): True if the run has converged ('absorbed' or 'equilibrated' reason).
+        """
+        values = np.atleast_1d(values)
+        indices = np.arange(self.num_of_values, self.num_of_values + len(values))
+        self.num_of_values += len(values)
+        if self.converged:
+            return True
+
+        recorded = values[(indices + 1) % (self.every or 1) == 0].tolist()
+        self.samples.extend(recorded)
+
+        if self.absorbing and not self._left:
+            self._left = any(value not in self.absorbing for value in recorded)
+
+        if (self._left and recorded and recorded[-1] in self.absorbing
+                and len(self.samples) >= self.min_samples):
+            self.reason = 'absorbed'
+        elif len(self.samples) >= self._next_check:
+            self._next_check = len(self.samples) + self.check_every
+            if self._equilibrated():
+                self.reason = 'equilibrated'
+        return self.converged
+
+    def _batch_means(self) -> tuple[np.ndarray, np.ndarray, int]:
+        """ method returning samples after burn-in, batch means and size of the batch. """
+        samples = np.asarray(self.samples[len(self.samples) // 2:])
+        batch_size = len(samples) // self.batches
+        if not batch_size:
+            return samples, np.zeros(0), 0
+        return samples, samples[:batch_size * self.batches].reshape(self.batches, batch_size).mean(axis=1), batch_size
+
+    def _equilibrated(self) -> bool:
+        late, batch_means, batch_size = self._batch_means()
+        early = np.asarray(self.samples[:len(self.samples) // 10])
+        early_size = len(early) // self.batches
+        if not len(batch_means) or not early_size:
+            return False
+
+        if batch_size < self.tau_factor * self.autocorrelation_time:
+            return False
+
+        early_means = early[:early_size * self.batches].reshape(self.batches, early_size).mean(axis=1)
+        standard_error = np.sqrt(early_means.var(ddof=1) / self.batches + batch_means.var(ddof=1) / self.batches)
+        return (abs(early_means.mean() - batch_means.mean()) <= self.z * standard_error
+                and self.standard_error <= self.tolerance)
+
+    @property
+    def mean(self) -> float:
+        """ mean of the samples after burn-in. """
+        return float(np.mean(self.samples[len(self.samples) // 2:]))
+
+    @property
+    def standard_error(self) -> float:
+        """ batch means standard error of the mean. """
+        _, batch_means, _ = self._batch_means()
+        if not len(batch_means):
+            return np.inf
+        return float(batch_means.std(ddof=1) / np.sqrt(self.batches))
+
+    @property
+    def autocorrelation_time(self) -> float:
+        """ batch means estimate of the integrated autocorrelation time (in recorded samples). """
+        samples, batch_means, batch_size = self._batch_means()
+        if not len(batch_means):
+            return np.inf
+        variance = samples.var(ddof=1)
+        if variance == 0:
+            return 1.
+        return float(max(batch_size * batch_means.var(ddof=1) / variance, 1.))
+
+    @property
+    def effective_sample_size(self) -> float:
+        """ number of samples after burn-in divided by the autocorrelation time. """
+        return (len(self.samples) - len(self.samples) // 2) / self.autocorrelation_time
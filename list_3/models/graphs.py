@@ -2,6 +2,7 @@ import networkx as nx
 import numpy as np
 import random
 from list_3.models.utils import random_triangular
+from list_3.models.profiling import phase, count
 
 
 def random_graph(n: int, p: float) -> nx.Graph:
@@ -22,16 +23,18 @@ def random_graph(n: int, p: float) -> nx.Graph:
     elif n <= 0:
         raise "n should be bigger than 0"
 
-    graph = nx.Graph()
+    with phase('graphs.random_graph'):
+        graph = nx.Graph()
 
-    """ add nodes """
-    graph.add_nodes_from(range(n))
+        """ add nodes """
+        graph.add_nodes_from(range(n))
 
-    """ add connections """
-    rnd_tria = random_triangular(n)
-    connection_cords = np.nonzero(rnd_tria > 1-p)
-    graph.add_edges_from(zip(*connection_cords))
+        """ add connections """
+        rnd_tria = random_triangular(n)
+        connection_cords = np.nonzero(rnd_tria > 1-p)
+        graph.add_edges_from(zip(*connection_cords))
 
+    count('graphs.edges', graph.number_of_edges())
     return graph
 
 
@@ -66,23 +69,31 @@ def watts_strogatz(n: int, k: int, beta: float) -> nx.Graph:
     graph.add_nodes_from(range(n))
 
     """ generate initial edges """
-    for node in nodes:
-        for target in range(k//2):
-            graph.add_edge(node, (node + target + 1) % n)
+    with phase('graphs.watts_strogatz.lattice'):
+        for node in nodes:
+            for target in range(k//2):
+                graph.add_edge(node, (node + target + 1) % n)
 
     """ reconnect nodes according to probability """
-    for node in nodes:
-        # initial connections
-        for target in graph[node].copy():
-            if target > node:
-                if np.random.rand() < beta:
-                    graph.remove_edge(node, target)
-                    new_connection = random.randrange(n)
-                    # no self-loops, no multiple edges
-                    while new_connection == node or new_connection in graph[node]:
+    rewired, rejected = 0, 0
+    with phase('graphs.watts_strogatz.rewiring'):
+        for node in nodes:
+            # initial connections
+            for target in graph[node].copy():
+                if target > node:
+                    if np.random.rand() < beta:
+                        graph.remove_edge(node, target)
                         new_connection = random.randrange(n)
-                    graph.add_edge(node, new_connection)
-
+                        # no self-loops, no multiple edges
+                        while new_connection == node or new_connection in graph[node]:
+                            new_connection = random.randrange(n)
+                            rejected += 1
+                        graph.add_edge(node, new_connection)
+                        rewired += 1
+
+    count('graphs.edges', graph.number_of_edges())
+    count('graphs.rewired_edges', rewired)
+    count('graphs.rejected_rewirings', rejected)
     return graph
 
 
@@ -118,23 +129,27 @@ def barabasi_albert(n: int, m: int):
     """ add connections for new nodes"""
     # number of existing connections at this point
     sum_of_existing_edges = m
-    for node in range(m+1, n):
-        # define probability 
-        probability = np.sum(adjacency_matrix, axis=0) / (sum_of_existing_edges * 2)
+    with phase('graphs.barabasi_albert.attachment'):
+        for node in range(m+1, n):
+            # define probability
+            probability = np.sum(adjacency_matrix, axis=0) / (sum_of_existing_edges * 2)
 
-        # choose connections
-        new_connections = np.random.choice(nodes, size=m, p=probability, replace=False)
+            # choose connections
+            new_connections = np.random.choice(nodes, size=m, p=probability, replace=False)
 
-        # add new connections
-        adjacency_matrix[new_connections, [node] * m] = 1
-        adjacency_matrix[[node] * m, new_connections] = 1
+            # add new connections
+            adjacency_matrix[new_connections, [node] * m] = 1
+            adjacency_matrix[[node] * m, new_connections] = 1
 
-        # update existing edges counter
-        sum_of_existing_edges += m
+            # update existing edges counter
+            sum_of_existing_edges += m
 
     """ add connections """
     # upper triangle to avoid adding same connection twice
-    connection_cords = np.nonzero(np.triu(adjacency_matrix))
-    graph.add_edges_from(zip(*connection_cords))
+    with phase('graphs.barabasi_albert.to_graph'):
+        connection_cords = np.nonzero(np.triu(adjacency_matrix))
+        graph.add_edges_from(zip(*connection_cords))
 
+    count('graphs.attached_nodes', max(n - m - 1, 0))
+    count('graphs.edges', graph.number_of_edges())
     return graph
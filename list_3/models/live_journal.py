@@ -5,6 +5,8 @@ from typing import Optional
 import pandas as pd
 import requests
 
+from list_3.models.profiling import phase, count
+
 
 class LiveJournal:
 
@@ -23,8 +25,11 @@ class LiveJournal:
         Returns:
             (set) not ordered list of friends.
         """
-        url = requests.get(f'{self.USER_FRIEND_LIST}{user}').text.splitlines()[:limit]
+        with phase('live_journal.fetch'):
+            url = requests.get(f'{self.USER_FRIEND_LIST}{user}').text.splitlines()[:limit]
         friends = set([it[2:] for it in url[1:-1]])
+        count('live_journal.fetches')
+        count('live_journal.friends', len(friends))
         return friends
 
     def explore_network(self, starting_user: str = 'valerois', depth: int = 2,
@@ -37,6 +42,14 @@ class LiveJournal:
             friend_limit (Optional[int]): optional limit of obtained friends for each of the  users.
         """
 
+        with phase('live_journal.explore_network'):
+            self._explore_network(starting_user, depth, friend_limit)
+
+        with phase('live_journal.save_network'):
+            self.save_network(name=f'{starting_user}_network_depth_{depth}.csv')
+
+    def _explore_network(self, starting_user: str, depth: int, friend_limit: Optional[int]) -> None:
+        """ breadth-first search of explore_network (without saving). """
         # init values
         current_depth = 1
         self.visited_friends.update([starting_user])
@@ -73,12 +86,11 @@ class LiveJournal:
                     # mark friends to queue as visited
                     friends_to_queue = [friend for friend in friends if friend not in self.visited_friends]
                     self.visited_friends.update(friends_to_queue)
+                    count('live_journal.already_visited', len(friends) - len(friends_to_queue))
 
                     # add not yet visited friends to the queue
                     friends_queue.extend(friends_to_queue)
 
-        self.save_network(name=f'{starting_user}_network_depth_{depth}.csv')
-
     def save_network(self, name: str) -> None:
         """ method saving network to the file
         Args:
@@ -1,9 +1,7 @@
 # all the functions in this file were prepared for other course with Bogna Jaszczak who is co-owner of 4 first functions
 # below.
 
-import matplotlib.pyplot as plt
 import numpy as np
-import scipy.stats
 from list_3.models.utils import show_statistics
 
 
@@ -17,6 +15,8 @@ def pdf_emp(data: np.array, bins: int = 100, show: bool = False, **kwargs) -> No
     Returns:
         None
     """
+    import matplotlib.pyplot as plt
+
     plt.hist(data, bins=bins, density=True, **kwargs)
     if show:
         plt.show()
@@ -31,6 +31,8 @@ def cdf_emp(data: np.array, show: bool = False, **kwargs) -> None:
     Returns:
         None
     """
+    import matplotlib.pyplot as plt
+
     data.sort()
     y = np.arange(len(data))/float(len(data))
 
@@ -39,7 +41,7 @@ def cdf_emp(data: np.array, show: bool = False, **kwargs) -> None:
         plt.show()
 
 
-def dist_cdf_plot(domain: tuple = (-4, 4), distribution=scipy.stats.norm, show: bool = False, **kwargs) -> None:
+def dist_cdf_plot(domain: tuple = (-4, 4), distribution=None, show: bool = False, **kwargs) -> None:
     """ function plotting a CDF of the given distribution.
     Args:
         domain (tuple): domain of the distribution.
@@ -49,13 +51,19 @@ def dist_cdf_plot(domain: tuple = (-4, 4), distribution=scipy.stats.norm, show:
     Returns:
         None
     """
+    import matplotlib.pyplot as plt
+    import scipy.stats
+
+    if distribution is None:
+        distribution = scipy.stats.norm
+
     x = np.linspace(domain[0], domain[1], 1000)
     plt.plot(x, distribution.cdf(x, **kwargs), 'r.')
     if show:
         plt.show()
 
 
-def dist_pdf_plot(domain: tuple = (-4, 4), distribution=scipy.stats.norm, discrete: bool = False, show: bool = False, **kwargs) -> None:
+def dist_pdf_plot(domain: tuple = (-4, 4), distribution=None, discrete: bool = False, show: bool = False, **kwargs) -> None:
     """ function plotting a PDF of the given distribution.
     Args:
         domain (tuple): domain of the distribution.
@@ -66,6 +74,12 @@ def dist_pdf_plot(domain: tuple = (-4, 4), distribution=scipy.stats.norm, discre
     Returns:
         None
     """
+    import matplotlib.pyplot as plt
+    import scipy.stats
+
+    if distribution is None:
+        distribution = scipy.stats.norm
+
     if discrete:
 
         x = np.linspace(domain[0], domain[1], 1+domain[1]-domain[0])
@@ -80,6 +94,8 @@ def dist_pdf_plot(domain: tuple = (-4, 4), distribution=scipy.stats.norm, discre
 
 def show_degree_distribution(network):
 
+    import matplotlib.pyplot as plt
+
     stats = show_statistics(network)
     print(f'statistics: {stats}')
 
@@ -0,0 +1,86 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+# stack of the active profiles (innermost last), empty when profiling is disabled
+_profiles = []
+_disabled_phase = nullcontext()
+
+
+class Profile:
+    """ Wall time of the phases and event counters recorded by the instrumented simulators and generators.
+    Attributes:
+        times (dict[str, float]): total wall time [s] of each phase.
+        calls (dict[str, int]): number of entries of each phase.
+        counters (dict[str, int]): event counters, e.g. 'q_voter.events', 'walk.neighbour_lookups'.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+
+    def as_dict(self) -> dict:
+        return {'times': dict(self.times), 'calls': dict(self.calls), 'counters': dict(self.counters)}
+
+    def report(self) -> str:
+        """ method returning the phases (sorted by time) and the counters as text table. """
+        lines = [f'{"phase":40} {"calls":>10} {"time [s]":>12}']
+        for name in sorted(self.times, key=self.times.get, reverse=True):
+            lines.append(f'{name:40} {self.calls[name]:>10} {self.times[name]:>12.4f}')
+        lines.append(f'{"counter":40} {"value":>10}')
+        for name in sorted(self.counters):
+            lines.append(f'{name:40} {self.counters[name]:>10}')
+        return '\n'.join(lines)
+
+
+class _Phase:
+    """ context manager adding wall time of its body to all the active profiles. """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        for profile in _profiles:
+            profile.times[self.name] += elapsed
+            profile.calls[self.name] += 1
+
+
+@contextmanager
+def profiling(callback: callable = None):
+    """ context manager enabling instrumentation for its body. Nested profiles record everything recorded by the
+        inner ones as well.
+    Args:
+        callback (callable): optional function called with the Profile on exit (e.g. to log it in a sweep).
+    Yields:
+        (Profile): collected times and counters.
+    Example:
+        with profiling() as profile:
+            QVoter(network).simulate(1000, 0.1, 3)
+        print(profile.report())
+    """
+    profile = Profile()
+    _profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        _profiles.remove(profile)
+        if callback is not None:
+            callback(profile)
+
+
+def phase(name: str):
+    """ function returning context manager timing phase <name> (shared no-op context when profiling is disabled). """
+    if not _profiles:
+        return _disabled_phase
+    return _Phase(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    """ function increasing counter <name> of the active profiles by <value> (no-op when profiling is disabled). """
+    for profile in _profiles:
+        profile.counters[name] += value
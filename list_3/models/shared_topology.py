@@ -0,0 +1,149 @@
+from multiprocessing import resource_tracker, shared_memory
+
+import networkx as nx
+import numpy as np
+
+from list_3.models.utils import to_csr
+
+
+class SharedTopology:
+    """ Read-only CSR adjacency of a graph in a single multiprocessing.shared_memory block, so processes share one
+    copy of the topology. Pickling sends only the name of the block - a worker attaches to it without copying.
+
+    Layout of the block: header int64[2] = (n, number of entries), indptr int64[n + 1], node ids int64[n],
+    indices int32[number of entries]. Node ids are the integer nodes of the graph, graphs with other nodes are
+    numbered by their position in the list of nodes.
+
+    Besides the arrays it implements the part of the nx.Graph interface used by the simulators (nodes, neighbors,
+    number_of_nodes, size), so QVoter and RandomWalkOnGraph run on it in a worker without the nx graph. The interface
+    returns python ints as nx.Graph does (e.g. results keyed by nodes stay json serializable).
+
+    The process which created the topology owns it: it should call unlink() (or use it as context manager) when
+    all the workers are done.
+
+    Attributes:
+        name (str): name of the shared memory block.
+        node_ids (np.array): node ids.
+        indptr (np.array): neighbours of node_ids[i] are node_ids[indices[indptr[i]:indptr[i + 1]]].
+        indices (np.array): positions of the neighbours.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory, owner: bool = False):
+        self._block = block
+        self._owner = owner
+        self.name = block.name
+
+        n, entries = np.ndarray(2, dtype=np.int64, buffer=block.buf)
+        offset = 16
+        self.indptr = np.ndarray(n + 1, dtype=np.int64, buffer=block.buf, offset=offset)
+        offset += 8 * (n + 1)
+        self.node_ids = np.ndarray(n, dtype=np.int64, buffer=block.buf, offset=offset)
+        offset += 8 * n
+        self.indices = np.ndarray(entries, dtype=np.int32, buffer=block.buf, offset=offset)
+        for array in (self.indptr, self.node_ids, self.indices):
+            array.flags.writeable = False
+
+        # node ids 0, ..., n - 1 (e.g. generated graphs) are their own positions
+        self._positional = bool((self.node_ids == np.arange(n)).all())
+        self._nodes = None
+        self._positions = None
+
+    @classmethod
+    def from_csr(cls, nodes: list | np.ndarray, indptr: np.array, indices: np.array,
+                 name: str | None = None) -> 'SharedTopology':
+        """ method copying CSR adjacency (e.g. of to_csr) to a new shared memory block. """
+        n, entries = len(indptr) - 1, int(indptr[-1])
+        block = shared_memory.SharedMemory(name=name, create=True, size=16 + 8 * (2 * n + 1) + 4 * max(entries, 1))
+
+        if all(isinstance(node, (int, np.integer)) for node in nodes):
+            node_ids = np.asarray(nodes, dtype=np.int64)
+        else:
+            node_ids = np.arange(n, dtype=np.int64)
+
+        np.ndarray(2, dtype=np.int64, buffer=block.buf)[:] = n, entries
+        offset = 16
+        np.ndarray(n + 1, dtype=np.int64, buffer=block.buf, offset=offset)[:] = indptr
+        offset += 8 * (n + 1)
+        np.ndarray(n, dtype=np.int64, buffer=block.buf, offset=offset)[:] = node_ids
+        offset += 8 * n
+        np.ndarray(entries, dtype=np.int32, buffer=block.buf, offset=offset)[:] = indices[:entries]
+        return cls(block, owner=True)
+
+    @classmethod
+    def from_graph(cls, graph, name: str | None = None) -> 'SharedTopology':
+        """ method creating shared topology of nx.Graph or any graph with to_csr() method (e.g. list_2 Graph). """
+        if isinstance(graph, nx.Graph):
+            return cls.from_csr(*to_csr(graph), name=name)
+        return cls.from_csr(*graph.to_csr(), name=name)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedTopology':
+        """ method attaching to existing shared topology by <name> (no copy). """
+        try:
+            # workers must not unlink the block at exit (python >= 3.13)
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # python < 3.13 registers attached blocks in the resource tracker of the process, which unlinks them when
+            # it exits - the registration is skipped (unregistering afterwards would remove the registration of the
+            # owner from the tracker shared with forked workers)
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: rtype == 'shared_memory' or register(name, rtype)
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        return cls(block)
+
+    def __reduce__(self):
+        return self.__class__.attach, (self.name,)
+
+    @property
+    def nodes(self) -> list[int]:
+        """ list of node ids as python ints (built on the first use). """
+        if self._nodes is None:
+            self._nodes = self.node_ids.tolist()
+        return self._nodes
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def size(self) -> int:
+        """ method returning number of edges (as nx.Graph.size). """
+        return int(self.indptr[-1]) // 2
+
+    def cache_key(self) -> tuple:
+        """ method returning the content of the topology (not the name of the block), used by DiskCache. """
+        return self.node_ids, self.indptr, self.indices
+
+    def degrees(self) -> np.array:
+        return np.diff(self.indptr)
+
+    def neighbors(self, node: int) -> list[int]:
+        """ method returning ids of the neighbours of <node> (as nx.Graph.neighbors). """
+        if self._positional:
+            i = node
+        else:
+            if self._positions is None:
+                self._positions = {node_id: i for i, node_id in enumerate(self.nodes)}
+            i = self._positions[node]
+        return self.node_ids[self.indices[self.indptr[i]:self.indptr[i + 1]]].tolist()
+
+    def close(self):
+        """ method detaching this process from the block (the arrays cannot be used afterwards). """
+        self.indptr = self.node_ids = self.indices = None
+        self._block.close()
+
+    def unlink(self):
+        """ method releasing the block (only by the owner). """
+        self.close()
+        if self._owner:
+            self._block.unlink()
+
+    def __enter__(self) -> 'SharedTopology':
+        return self
+
+    def __exit__(self, *exc):
+        self.unlink()
@@ -1,6 +1,7 @@
+from functools import lru_cache
+
 import networkx as nx
 import numpy as np
-from pydantic import BaseModel
 
 
 def random_triangular(size: int) -> np.array:
@@ -18,11 +19,39 @@ def random_triangular(size: int) -> np.array:
     return matrix
 
 
-class Stat(BaseModel):
-    vertices: int
-    edges: int
-    mean_degree: float
-    var_degree: float
+def to_csr(graph) -> tuple[list, np.array, np.array]:
+    """ function returning CSR adjacency of the graph.
+    Args:
+        graph (nx.Graph | SharedTopology): graph instance. Arrays of SharedTopology are returned without copy.
+    Returns:
+        (tuple[list, np.array, np.array]): list of nodes, indptr and indices - positions (in the list of nodes) of the
+                                           neighbours of nodes[i] are indices[indptr[i]:indptr[i + 1]]
+    """
+    if not isinstance(graph, nx.Graph) and hasattr(graph, 'indptr'):
+        return graph.node_ids, graph.indptr, graph.indices
+
+    nodes = list(graph.nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
+
+    degrees = [graph.degree(node) for node in nodes]
+    indptr = np.concatenate([[0], np.cumsum(degrees)]).astype(np.int64)
+    indices = np.fromiter((node_index[neighbour] for node in nodes for neighbour in graph.neighbors(node)),
+                          dtype=np.int32, count=indptr[-1])
+    return nodes, indptr, indices
+
+
+@lru_cache(maxsize=None)
+def _stat_model() -> type:
+    """ function returning pydantic model of the base statistics (pydantic is imported on the first use). """
+    from pydantic import BaseModel
+
+    class Stat(BaseModel):
+        vertices: int
+        edges: int
+        mean_degree: float
+        var_degree: float
+
+    return Stat
 
 
 def show_statistics(graph: nx.Graph) -> dict:
@@ -33,8 +62,8 @@ def show_statistics(graph: nx.Graph) -> dict:
         (dict): dict containing base statistics of given graph
     """
     degree = [it[1] for it in graph.degree]
-    stat = Stat(vertices=graph.number_of_nodes(), edges=graph.number_of_edges(), mean_degree=np.mean(degree),
-                var_degree=np.var(degree))
+    stat = _stat_model()(vertices=graph.number_of_nodes(), edges=graph.number_of_edges(),
+                         mean_degree=np.mean(degree), var_degree=np.var(degree))
     return stat.dict()
 
 
@@ -1,11 +1,23 @@
 from .random_walk import RandomWalk, PearsonRandomWalk
 from .random_walk_on_graph import RandomWalkOnGraph
+from .observers import Observer, DisplacementObserver, MSDObserver, OccupationObserver, ReturnTimeObserver
+from .trajectory import Trajectory
+from .walk_renderer import BlitRenderer, WalkRenderer, WalkOnGraphRenderer
 
 
 __all__ = [
     RandomWalk,
     PearsonRandomWalk,
-    RandomWalkOnGraph
+    RandomWalkOnGraph,
+    Trajectory,
+    Observer,
+    DisplacementObserver,
+    MSDObserver,
+    OccupationObserver,
+    ReturnTimeObserver,
+    BlitRenderer,
+    WalkRenderer,
+    WalkOnGraphRenderer
 ]
 
 
@@ -0,0 +1,179 @@
+import numpy as np
+
+
+class Observer:
+    """ Base class of the walk observers. Observer is fed with consecutive chunks of positions of the walk (the first
+    chunk starts with the starting position) and keeps only running statistics, so walks of any length can be
+    analysed in constant memory.
+
+    Subclasses define update and result.
+    """
+
+    def __init__(self):
+        self.num_of_positions = 0
+
+    def update(self, chunk: np.array) -> None:
+        """ method updating the statistics with the next <chunk> of positions. """
+        raise NotImplementedError
+
+    def result(self):
+        """ method returning current value of the statistics. """
+        raise NotImplementedError
+
+
+def _merge_moments(count: int, mean: float, m2: float, values: np.array) -> tuple[int, float, float]:
+    """ function merging running (count, mean, sum of squared deviations) with <values> (Chan et al. parallel
+        version of Welford's algorithm). """
+    if len(values) == 0:
+        return count, mean, m2
+
+    chunk_count, chunk_mean = len(values), np.mean(values)
+    chunk_m2 = np.sum((values - chunk_mean) ** 2)
+
+    total = count + chunk_count
+    delta = chunk_mean - mean
+    mean = mean + delta * chunk_count / total
+    m2 = m2 + chunk_m2 + delta ** 2 * count * chunk_count / total
+    return total, mean, m2
+
+
+class DisplacementObserver(Observer):
+    """ Welford mean and variance of the displacement |x(t) - x(0)| over all positions of the walk (coordinates
+    only). """
+
+    def __init__(self):
+        super().__init__()
+        self.origin = None
+        self._count, self._mean, self._m2 = 0, 0.0, 0.0
+
+    def update(self, chunk: np.array) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if self.origin is None:
+            self.origin = chunk[0]
+
+        displacement = np.linalg.norm(chunk - self.origin, axis=1)
+        self._count, self._mean, self._m2 = _merge_moments(self._count, self._mean, self._m2, displacement)
+        self.num_of_positions += len(chunk)
+
+    def result(self) -> dict:
+        """ Returns: (dict): mean and variance of the displacement. """
+        return {'mean': self._mean, 'var': self._m2 / self._count if self._count else np.nan}
+
+
+class MSDObserver(Observer):
+    """ mean squared displacement <|x(t + lag) - x(t)|^2> for lags 1, ..., <max_lag> (coordinates only). Only the
+    last <max_lag> positions are kept between chunks.
+    Attributes:
+        max_lag (int): maximal time lag. Defaults to 100.
+    """
+
+    def __init__(self, max_lag: int = 100):
+        super().__init__()
+        self.max_lag = max_lag
+
+        self._tail = None
+        self._sums = np.zeros(max_lag)
+        self._counts = np.zeros(max_lag, dtype=np.int64)
+
+    def update(self, chunk: np.array) -> None:
+        chunk = np.asarray(chunk, dtype=np.float64)
+        positions = chunk if self._tail is None else np.concatenate([self._tail, chunk])
+        tail_length = len(positions) - len(chunk)
+
+        # only pairs ending in the new chunk, the other ones were counted before
+        for lag in range(1, min(self.max_lag, len(positions) - 1) + 1):
+            first = max(lag, tail_length)
+            squared = np.sum((positions[first:] - positions[first - lag:len(positions) - lag]) ** 2, axis=1)
+            self._sums[lag - 1] += np.sum(squared)
+            self._counts[lag - 1] += len(squared)
+
+        self._tail = positions[-self.max_lag:]
+        self.num_of_positions += len(chunk)
+
+    def result(self) -> np.array:
+        """ Returns: (np.array): msd[lag - 1] for lag in 1, ..., max_lag (nan for lags longer than the walk). """
+        with np.errstate(invalid='ignore'):
+            return self._sums / self._counts
+
+
+class OccupationObserver(Observer):
+    """ number of visits of each position. Node ids (non-negative ints) are counted with np.bincount, coordinates and
+    other nodes (e.g. user names) in a dict. """
+
+    def __init__(self):
+        super().__init__()
+        self._bincount = np.zeros(0, dtype=np.int64)
+        self._counter = {}
+
+    def update(self, chunk: np.array) -> None:
+        chunk = np.asarray(chunk)
+        if chunk.ndim == 1 and np.issubdtype(chunk.dtype, np.integer):
+            counts = np.bincount(chunk)
+            if len(counts) > len(self._bincount):
+                self._bincount = np.concatenate([self._bincount, np.zeros(len(counts) - len(self._bincount),
+                                                                          dtype=np.int64)])
+            self._bincount[:len(counts)] += counts
+        elif chunk.ndim == 1:
+            for position in chunk.tolist():
+                self._counter[position] = self._counter.get(position, 0) + 1
+        else:
+            positions, counts = np.unique(chunk, axis=0, return_counts=True)
+            for position, count in zip(map(tuple, positions.tolist()), counts.tolist()):
+                self._counter[position] = self._counter.get(position, 0) + count
+
+        self.num_of_positions += len(chunk)
+
+    def result(self) -> tuple[np.array, np.array]:
+        """ Returns: (tuple[np.array, np.array]): visited positions, number of visits (same format as
+            Trajectory.occupation_counts). """
+        if self._counter:
+            positions = sorted(self._counter)
+            counts = np.array([self._counter[position] for position in positions])
+            if isinstance(positions[0], tuple):
+                # coordinates
+                return np.array(positions), counts
+            return np.fromiter(positions, dtype=object, count=len(positions)), counts
+
+        positions = np.flatnonzero(self._bincount)
+        return positions, self._bincount[positions]
+
+
+class ReturnTimeObserver(Observer):
+    """ first return time and Welford mean / variance of times between consecutive visits of <position>.
+    Attributes:
+        position: investigated position. Defaults to None, i.e. starting position.
+    """
+
+    def __init__(self, position=None):
+        super().__init__()
+        self.position = position
+
+        self._last_visit = None
+        self.first_return_time = None
+        self._count, self._mean, self._m2 = 0, 0.0, 0.0
+
+    def update(self, chunk: np.array) -> None:
+        chunk = np.asarray(chunk)
+        if self.position is None:
+            self.position = chunk[0]
+
+        visits = np.all((chunk == self.position).reshape(len(chunk), -1), axis=1)
+        visits = np.flatnonzero(visits) + self.num_of_positions
+
+        if len(visits):
+            if self._last_visit is not None:
+                visits = np.concatenate([[self._last_visit], visits])
+            return_times = np.diff(visits)
+
+            if self.first_return_time is None and len(return_times):
+                self.first_return_time = int(return_times[0])
+            self._count, self._mean, self._m2 = _merge_moments(self._count, self._mean, self._m2, return_times)
+            self._last_visit = visits[-1]
+
+        self.num_of_positions += len(chunk)
+
+    def result(self) -> dict:
+        """ Returns: (dict): first return time, number of returns, mean and variance of return times. """
+        return {'first_return_time': self.first_return_time, 'returns': self._count,
+                'mean': self._mean if self._count else np.nan,
+                'var': self._m2 / self._count if self._count else np.nan}
@@ -1,9 +1,9 @@
 import numpy as np
 from enum import Enum
-import matplotlib.pyplot as plt
-import glob
-import imageio
-from natsort import natsorted
+
+from list_4.models.observers import Observer
+from list_4.models.trajectory import Trajectory
+from list_4.models.walk_renderer import WalkRenderer, show_frame
 
 
 class Direction(Enum):
@@ -17,6 +17,9 @@ class Direction(Enum):
 class RandomWalk:
     """ 2 dimensional random walk class with equal probability distribution for each direction."""
 
+    # type of the positions stored in Trajectory
+    position_dtype = np.int32
+
     def __init__(self):
         self.position = None
         self.list_of_positions = []
@@ -36,6 +39,12 @@ class RandomWalk:
         """ function choosing direction for random walk"""
         return np.random.choice(list(Direction)).value
 
+    @staticmethod
+    def choose_directions(size: int) -> np.array:
+        """ function choosing <size> directions for random walk at once. """
+        directions = np.array([direction.value for direction in Direction])
+        return directions[np.random.randint(len(directions), size=size)]
+
     def generate(self, starting_position: tuple = (0, 0), num_of_steps: int = 1000) -> list[tuple]:
         """ method generating a walk.
         Args:
@@ -62,51 +71,78 @@ class RandomWalk:
 
         return self.list_of_positions
 
+    def generate_chunks(self, starting_position: tuple = (0, 0), num_of_steps: int = 1000, chunk_size: int = 100000):
+        """ generator of the walk in vectorized chunks of positions (np.array of shape (<= chunk_size, 2)). The first
+            chunk starts with the starting position.
+        Args:
+            starting_position (tuple): starting position. Defaults to (0,0)
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        """
+        position = np.array(starting_position, dtype=float)
+        yield position[None, :]
+
+        steps_left = num_of_steps
+        while steps_left:
+            size = min(chunk_size, steps_left)
+            chunk = position + np.cumsum(self.choose_directions(size), axis=0)
+            yield chunk
+
+            position = chunk[-1]
+            steps_left -= size
+
+    def generate_trajectory(self, starting_position: tuple = (0, 0), num_of_steps: int = 1000,
+                            chunk_size: int = 100000) -> Trajectory:
+        """ method generating a walk in vectorized chunks of <chunk_size> steps straight into compact Trajectory
+            (list_of_positions is not filled).
+        Args:
+            starting_position (tuple): starting position. Defaults to (0,0)
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        Returns:
+            (Trajectory): trajectory of the walk.
+        """
+        trajectory = Trajectory(dtype=self.position_dtype, shape=(2,), capacity=num_of_steps + 1)
+        for chunk in self.generate_chunks(starting_position, num_of_steps, chunk_size):
+            trajectory.append(chunk)
+        return trajectory
+
+    def observe(self, observers: list[Observer], starting_position: tuple = (0, 0), num_of_steps: int = 1000,
+                chunk_size: int = 100000) -> list[Observer]:
+        """ method generating a walk and feeding each chunk of it to the <observers>. Positions are not retained,
+            so memory does not depend on <num_of_steps>.
+        Args:
+            observers (list[Observer]): observers updated with each chunk, e.g. MSDObserver, OccupationObserver.
+            starting_position (tuple): starting position. Defaults to (0,0)
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        Returns:
+            (list[Observer]): given observers.
+        """
+        for chunk in self.generate_chunks(starting_position, num_of_steps, chunk_size):
+            for observer in observers:
+                observer.update(chunk)
+        return observers
+
+    def get_trajectory(self) -> Trajectory:
+        """ method returning list_of_positions as compact Trajectory. """
+        return Trajectory.from_positions(self.list_of_positions, dtype=self.position_dtype)
+
     def save_walk_to_pngs(self, destination: str = 'data/', color: str = 'b', new_step_color: str = 'r',
-                          show: bool = False):
+                          show: bool = False, processes: int | None = 1):
         """ function saving each move (with old moves before it) to png
         Args:
             destination (str): folder destination. Defaults to 'data/'.
             color (str): color of the walk. Defaults to 'b'
             new_step_color (str): color of newly added step to the walk. Defaults to 'r'
-            show (bool): plt.show() indicator. Defaults to False
+            show (bool): plt.show() indicator (shows the last frame). Defaults to False
+            processes (int | None): number of processes rendering the frames. Defaults to 1. None means all cores.
         """
-        x_axis = [pos[0] for pos in self.list_of_positions]
-        y_axis = [pos[1] for pos in self.list_of_positions]
-
-        plt.figure()
-        plt.grid()
-        plt.xlim([min(x_axis) - 1, max(x_axis) + 1])
-        plt.ylim([min(y_axis) - 1, max(y_axis) + 1])
-
-        # initial value for first step
-        initial_position = self.list_of_positions[0]
-        plt.title(f'Random Graph. Starting position: {initial_position}, step 0.')
-
-        # write with new color
-        plt.plot(initial_position[0], initial_position[1], f'{new_step_color}o')
-        plt.savefig(f'{destination}/{self.__class__.__name__}_step_0.png')
-
-        # change color to standard
-        plt.plot(initial_position[0], initial_position[1], f'{color}o')
-
-        prev_position = initial_position
-        for i, position in enumerate(self.list_of_positions[1:]):
-            plt.title(f'Random Graph. Starting position: {initial_position}, step {i+1}')
-
-            # write with new color
-            plt.plot([prev_position[0], position[0]], [prev_position[1], position[1]], f'{new_step_color}-')
-            plt.plot(position[0], position[1], f'{new_step_color}o')
-            plt.savefig(f'{destination}/{self.__class__.__name__}_step_{i+1}.png')
-
-            # change color to standard
-            plt.plot([prev_position[0], position[0]], [prev_position[1], position[1]], f'{color}-')
-            plt.plot(position[0], position[1], f'{color}o')
-
-            prev_position = position
+        renderer = WalkRenderer(self.list_of_positions, color=color, new_step_color=new_step_color)
+        paths = renderer.save_pngs(destination, self.__class__.__name__, processes=processes)
 
         if show:
-            plt.show()
+            show_frame(paths[-1])
 
         return
 
@@ -125,19 +161,16 @@ class RandomWalk:
         if not filename:
             filename = f'{self.__class__.__name__}.gif'
 
-        self.save_walk_to_pngs(destination=destination, color=color, new_step_color=new_step_color, show=False)
-
-        files = natsorted(glob.glob(f'{destination}/{self.__class__.__name__}_step_*.png'))
-        images = []
-
-        for file in files:
-            images.append(imageio.imread(file))
-            imageio.mimsave(f'{destination}/{filename}', images, duration=step_time)
+        renderer = WalkRenderer(self.list_of_positions, color=color, new_step_color=new_step_color)
+        renderer.save(f'{destination}/{filename}', step_time=step_time)
         return
 
 
 class PearsonRandomWalk(RandomWalk):
     """ 2 dimensional Pearson random walk class with equal probability distribution for each direction. """
+
+    position_dtype = np.float32
+
     def __init__(self):
         super().__init__()
 
@@ -149,6 +182,12 @@ class PearsonRandomWalk(RandomWalk):
         y = np.sin(chosen_angle)
         return x, y
 
+    @staticmethod
+    def choose_directions(size: int) -> np.array:
+        """ function choosing <size> directions for Pearson's random walk at once. """
+        chosen_angles = np.random.random(size) * 2 * np.pi
+        return np.column_stack([np.cos(chosen_angles), np.sin(chosen_angles)])
+
     def get_stats(self, num_of_trajectories: int = 100, starting_position: tuple = (0, 0), num_of_steps: int = 1000)\
                   -> tuple[list[float], list[float]]:
         """ function generating statistics for <num_of_trajectories> of monte carlo trajectories
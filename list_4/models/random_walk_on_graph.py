@@ -1,13 +1,24 @@
-import glob
 from copy import copy
 
-import imageio
 import numpy as np
 import networkx as nx
-from matplotlib import pyplot as plt
-from natsort import natsorted
 
-from list_3.models import random_graph
+from list_3.models import count, phase, random_graph, to_csr
+from list_4.models.observers import Observer
+from list_4.models.trajectory import Trajectory
+from list_4.models.walk_renderer import WalkOnGraphRenderer, show_frame
+
+
+def _labels(nodes) -> np.ndarray | None:
+    """ function returning None if all the <nodes> are integers fitting int32 (walks store the node ids themselves),
+        object array of the nodes otherwise (walks store positions in it). """
+    if isinstance(nodes, np.ndarray) and np.issubdtype(nodes.dtype, np.integer):
+        if not len(nodes) or (nodes.min() >= np.iinfo(np.int32).min and nodes.max() <= np.iinfo(np.int32).max):
+            return None
+    elif all(isinstance(node, (int, np.integer)) and np.iinfo(np.int32).min <= node <= np.iinfo(np.int32).max
+             for node in nodes):
+        return None
+    return np.fromiter(nodes, dtype=object, count=len(nodes))
 
 
 class RandomWalkOnGraph:
@@ -31,6 +42,7 @@ class RandomWalkOnGraph:
 
     def choose_direction(self):
         """ function choosing direction for random walk on graph"""
+        count('walk.neighbour_lookups')
         neighbors = [it for it in self._network.neighbors(self.position)]
         if neighbors:
             return np.random.choice(neighbors)
@@ -55,60 +67,130 @@ class RandomWalkOnGraph:
         self.position = starting_position
         self.update_list_of_positions()
 
-        for _ in range(num_of_steps):
-            direction = self.choose_direction()
-            self.move(direction)
-            self.update_list_of_positions()
+        with phase('walk.generate'):
+            for _ in range(num_of_steps):
+                direction = self.choose_direction()
+                self.move(direction)
+                self.update_list_of_positions()
 
+        count('walk.steps', num_of_steps)
         return self.list_of_positions
 
-    def save_walk_to_pngs(self, filename: str | bool = None, destination: str = 'data/', color: str = 'b', new_step_color: str = 'r',
-                          prev_color='g',show: bool = False):
+    def _csr(self) -> tuple[list, np.ndarray | None, np.array, np.array]:
+        """ method returning nodes, their labels (see _labels), indptr and indices of the network. """
+        nodes, indptr, indices = to_csr(self._network)
+        return nodes, _labels(nodes), indptr, indices
+
+    def _walk_positions(self, nodes: list, indptr: np.array, indices: np.array, starting_position,
+                        num_of_steps: int, chunk_size: int):
+        """ generator of the walk over CSR adjacency in chunks of int32 positions in <nodes> (random numbers are drawn
+            for the whole chunk at once). The first chunk is the position of the starting node. """
+        # memoryviews index as fast as lists without copying the (possibly shared) arrays
+        indptr, indices = memoryview(np.ascontiguousarray(indptr)), memoryview(np.ascontiguousarray(indices))
+
+        if isinstance(nodes, np.ndarray):
+            current = int(np.flatnonzero(nodes == starting_position)[0])
+        else:
+            current = nodes.index(starting_position)
+        yield np.array([current], dtype=np.int32)
+
+        steps_left = num_of_steps
+        while steps_left:
+            size = min(chunk_size, steps_left)
+            chunk = []
+            for u in np.random.random(size).tolist():
+                start, end = indptr[current], indptr[current + 1]
+                # if there are no neighbours we just don't move.
+                if end > start:
+                    current = indices[start + int(u * (end - start))]
+                chunk.append(current)
+            yield np.array(chunk, dtype=np.int32)
+
+            steps_left -= size
+
+    def generate_chunks(self, starting_position=0, num_of_steps: int = 1000, chunk_size: int = 100000):
+        """ generator of the walk over CSR adjacency in chunks of node ids - int32 array for integer nodes, object
+            array of the nodes otherwise (e.g. user names). The first chunk starts with the starting node. The network
+            may be SharedTopology attached in a worker process.
+        Args:
+            starting_position: starting node. Defaults to 0.
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        """
+        nodes, labels, indptr, indices = self._csr()
+        node_ids = np.asarray(nodes, dtype=np.int32) if labels is None else labels
+        for chunk in self._walk_positions(nodes, indptr, indices, starting_position, num_of_steps, chunk_size):
+            yield node_ids[chunk]
+
+    def generate_trajectory(self, starting_position=0, num_of_steps: int = 1000,
+                            chunk_size: int = 100000) -> Trajectory:
+        """ method generating a walk straight into compact Trajectory (list_of_positions is not filled). Integer nodes
+            are stored as int32 node ids, other nodes as int32 positions in Trajectory.labels.
+        Args:
+            starting_position: starting node. Defaults to 0.
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        Returns:
+            (Trajectory): trajectory of the walk.
+        """
+        nodes, labels, indptr, indices = self._csr()
+        node_ids = np.asarray(nodes, dtype=np.int32) if labels is None else None
+
+        trajectory = Trajectory(dtype=np.int32, capacity=num_of_steps + 1, labels=labels)
+        for chunk in self._walk_positions(nodes, indptr, indices, starting_position, num_of_steps, chunk_size):
+            trajectory.append(chunk if node_ids is None else node_ids[chunk])
+        return trajectory
+
+    def observe(self, observers: list[Observer], starting_position: int = 0, num_of_steps: int = 1000,
+                chunk_size: int = 100000) -> list[Observer]:
+        """ method generating a walk and feeding each chunk of it to the <observers>. Positions are not retained,
+            so memory does not depend on <num_of_steps>.
+        Args:
+            observers (list[Observer]): observers updated with each chunk, e.g. OccupationObserver.
+            starting_position (int): starting node. Defaults to 0.
+            num_of_steps (int): number of steps of the walk
+            chunk_size (int): number of steps generated at once. Defaults to 100000.
+        Returns:
+            (list[Observer]): given observers.
+        """
+        for chunk in self.generate_chunks(starting_position, num_of_steps, chunk_size):
+            for observer in observers:
+                observer.update(chunk)
+        return observers
+
+    def get_trajectory(self) -> Trajectory:
+        """ method returning list_of_positions as compact Trajectory of int32 node ids (positions in
+            Trajectory.labels for non-integer nodes). """
+        labels = _labels(self.list_of_positions)
+        if labels is None:
+            return Trajectory.from_positions(self.list_of_positions, dtype=np.int32)
+
+        nodes = list(dict.fromkeys(self.list_of_positions))
+        position = {node: i for i, node in enumerate(nodes)}
+        return Trajectory.from_positions([position[node] for node in self.list_of_positions], dtype=np.int32,
+                                         labels=_labels(nodes))
+
+    def save_walk_to_pngs(self, filename: str | bool = None, destination: str = 'data/', color: str = 'b',
+                          new_step_color: str = 'r', prev_color='g', show: bool = False, processes: int | None = 1):
         """ function saving each move (with old moves before it) to png
         Args:
             filename (str | bool): custom filename.
             destination (str): folder destination. Defaults to 'data/'.
             color (str): color of the walk. Defaults to 'b'
             new_step_color (str): color of newly added step to the walk. Defaults to 'r'
-            show (bool): plt.show() indicator. Defaults to False
+            show (bool): plt.show() indicator (shows the last frame). Defaults to False
+            processes (int | None): number of processes rendering the frames. Defaults to 1. None means all cores.
         """
         if not filename:
             filename = f'{self.__class__.__name__}'
 
-        layout = nx.circular_layout(self._network)
-
-        plt.figure()
-        # initial value for first step
-        initial_position = self.list_of_positions[0]
-        plt.title(f'Random walk on graph. Starting position: {initial_position}, step 0.')
-
-        # write with new color
-        nx.draw_networkx(self._network, pos=layout, node_color=color, edge_color=color)
-        nx.draw_networkx_nodes([initial_position], pos=layout, node_color=new_step_color)
-        plt.savefig(f'{destination}/{filename}_step_0.png')
-
-        # change color to standard
-        nx.draw_networkx_nodes([initial_position], pos=layout, node_color=prev_color)
-
-        prev_position = initial_position
-        for i, position in enumerate(self.list_of_positions[1:]):
-            plt.title(f'Random walk on graph. Starting position: {initial_position}, step {i + 1}')
-
-            # write with new color
-            nx.draw_networkx_nodes([position], pos=layout, node_color=new_step_color)
-            nx.draw_networkx_edges(self._network, edgelist=[(prev_position, position)], pos=layout,
-                                   edge_color=new_step_color)
-            plt.savefig(f'{destination}/{filename}_step_{i + 1}.png')
-
-            # change color to standard
-            nx.draw_networkx_nodes([position], pos=layout, node_color=prev_color)
-            nx.draw_networkx_edges(self._network, edgelist=[(prev_position, position)], pos=layout,
-                                   edge_color=prev_color)
-
-            prev_position = position
+        # layout is computed once and shared by all the frames (and processes)
+        renderer = WalkOnGraphRenderer(self._network, self.list_of_positions, layout=nx.circular_layout(self._network),
+                                       color=color, new_step_color=new_step_color, prev_color=prev_color)
+        paths = renderer.save_pngs(destination, filename, processes=processes)
 
         if show:
-            plt.show()
+            show_frame(paths[-1])
 
     def save_walk_to_gif(self, filename: str | bool = None, destination: str = 'data/', step_time: int = 1,
                          color: str = 'b', new_step_color: str = 'r', prev_color='g') -> None:
@@ -125,23 +207,20 @@ class RandomWalkOnGraph:
         if not filename:
             filename = f'{self.__class__.__name__}'
 
-        self.save_walk_to_pngs(filename=filename, destination=destination, color=color, new_step_color=new_step_color,
-                               prev_color=prev_color, show=False)
-
-        files = natsorted(glob.glob(f'{destination}/{filename}_step_*.png'))
-        images = []
-
-        for file in files:
-            images.append(imageio.imread(file))
-            imageio.mimsave(f'{destination}/{filename}.gif', images, duration=step_time)
+        renderer = WalkOnGraphRenderer(self._network, self.list_of_positions, color=color,
+                                       new_step_color=new_step_color, prev_color=prev_color)
+        renderer.save(f'{destination}/{filename}.gif', step_time=step_time)
         return
 
     def get_stats(self, starting_node: int = 0, max_iter: int = 1000):
-        """
+        """ method walking from <starting_node> until all the nodes reachable from it are hit (or <max_iter> steps).
+            Nodes outside its connected component are never hit, so the walk stops once the component is covered
+            instead of running to <max_iter>.
         Args:
             starting_node:
             max_iter:
         Returns:
+            (dict): time to hit of each node but the starting one (np.inf for not hit nodes).
         """
 
         nodes = list(self._network.nodes)
@@ -150,20 +229,42 @@ class RandomWalkOnGraph:
         unvisited_nodes.remove(starting_node)
         time_to_hit = {it: np.inf for it in unvisited_nodes}
 
+        # reachable nodes not hit yet
+        component = self._component(starting_node)
+        unvisited_reachable = component - {starting_node}
+
         i = 1
         self.move(starting_node)
-        while i <= max_iter and unvisited_nodes:
-            current_node = self.choose_direction()
-            self.move(current_node)
-
-            if current_node in unvisited_nodes:
-                unvisited_nodes.remove(current_node)
-                time_to_hit[current_node] = i
-            i += 1
+        with phase('walk.get_stats'):
+            while i <= max_iter and unvisited_reachable:
+                current_node = self.choose_direction()
+                self.move(current_node)
+
+                if current_node in unvisited_reachable:
+                    unvisited_reachable.remove(current_node)
+                    time_to_hit[current_node] = i
+                i += 1
+
+        count('walk.steps', i - 1)
+        count('walk.hit_nodes', len(component) - 1 - len(unvisited_reachable))
         return time_to_hit
 
+    def _component(self, node) -> set:
+        """ method returning connected component of <node> (breadth-first search over neighbors). """
+        component, frontier = {node}, [node]
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for neighbour in self._network.neighbors(current):
+                    if neighbour not in component:
+                        component.add(neighbour)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return component
 
 if __name__ == "__main__":
+    from matplotlib import pyplot as plt
+
     x = random_graph(10, .2)
     rwog = RandomWalkOnGraph()
     rwog.network = x
@@ -0,0 +1,164 @@
+import numpy as np
+
+
+class Trajectory:
+    """ Compact storage of a walk backed by a typed numpy array (a few bytes per step instead of a python tuple / int).
+
+    Positions are appended in chunks to a growing buffer. Trajectory can be saved to .npy / .npz file and loaded back
+    (.npy files are memory-mapped, so long walks can be analysed without loading them into memory). Derived
+    statistics are computed lazily and cached until the next append.
+
+    Attributes:
+        dtype (np.dtype): type of the stored positions, e.g. np.int32 for node ids or lattice coordinates, np.float32
+                          for off-lattice coordinates.
+        shape (tuple): shape of a single position, () for node ids, (2,) for 2 dimensional coordinates.
+        labels (np.ndarray | None): labels of the positions, e.g. non-integer nodes of a graph - positions are then
+                                    indices of the labels, and the statistics report (and accept) the labels.
+                                    Defaults to None.
+    """
+
+    def __init__(self, dtype: np.dtype = np.int32, shape: tuple = (), capacity: int = 1024,
+                 labels: np.ndarray | None = None):
+        self.dtype = np.dtype(dtype)
+        self.shape = tuple(shape)
+        self.labels = labels
+
+        self._data = np.empty((capacity,) + self.shape, dtype=self.dtype)
+        self._size = 0
+        self._stats = {}
+
+    @classmethod
+    def from_positions(cls, list_of_positions: list, dtype: np.dtype = np.int32,
+                       labels: np.ndarray | None = None) -> 'Trajectory':
+        """ method creating trajectory from the list of positions (e.g. RandomWalk.list_of_positions). """
+        positions = np.asarray(list_of_positions, dtype=dtype)
+        trajectory = cls(dtype=dtype, shape=positions.shape[1:], capacity=len(positions), labels=labels)
+        trajectory.append(positions)
+        return trajectory
+
+    @property
+    def positions(self) -> np.array:
+        """ array of the positions of the walk, shape (len(self),) + self.shape """
+        return self._data[:self._size]
+
+    @property
+    def labelled_positions(self) -> np.array:
+        """ array of the positions mapped to their labels (positions themselves if there are no labels). """
+        return self.positions if self.labels is None else self.labels[self.positions]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, item):
+        return self.positions[item]
+
+    def append(self, chunk) -> None:
+        """ method appending <chunk> of positions (array-like of shape (n,) + self.shape) to the trajectory. """
+        chunk = np.asarray(chunk, dtype=self.dtype).reshape((-1,) + self.shape)
+        needed = self._size + len(chunk)
+
+        if needed > len(self._data) or not self._data.flags.writeable:
+            # amortized growth (loaded trajectories are read-only, they are copied on the first append)
+            data = np.empty((max(needed, 2 * len(self._data)),) + self.shape, dtype=self.dtype)
+            data[:self._size] = self.positions
+            self._data = data
+
+        self._data[self._size:needed] = chunk
+        self._size = needed
+        self._stats = {}
+
+    def save(self, path: str) -> None:
+        """ method saving positions to .npz (compressed) or .npy file (any other extension). Labels (integer or
+            string only - they are loaded without pickle) are saved to .npz files only. """
+        if path.endswith('.npz'):
+            arrays = {'positions': self.positions}
+            if self.labels is not None:
+                arrays['labels'] = np.asarray(self.labels.tolist())
+                if arrays['labels'].ndim != 1 or arrays['labels'].dtype == object:
+                    raise ValueError("only integer or string labels can be saved")
+            np.savez_compressed(path, **arrays)
+        else:
+            if self.labels is not None:
+                raise ValueError("trajectory with labels has to be saved to .npz file")
+            np.save(path, self.positions)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Trajectory':
+        """ method loading trajectory saved by Trajectory.save.
+        Args:
+            path (str): path of the file.
+            mmap (bool): memory-map .npy file instead of reading it. Defaults to True. Ignored for .npz files.
+        Returns:
+            (Trajectory): loaded trajectory.
+        """
+        labels = None
+        if path.endswith('.npz'):
+            with np.load(path) as file:
+                positions = file['positions']
+                if 'labels' in file.files:
+                    labels = np.fromiter(file['labels'].tolist(), dtype=object, count=len(file['labels']))
+        else:
+            positions = np.load(path, mmap_mode='r' if mmap else None)
+
+        trajectory = cls(dtype=positions.dtype, shape=positions.shape[1:], capacity=0, labels=labels)
+        trajectory._data = positions
+        trajectory._size = len(positions)
+        return trajectory
+
+    def _cached(self, key, function):
+        if key not in self._stats:
+            self._stats[key] = function()
+        return self._stats[key]
+
+    def msd(self, max_lag: int = 100) -> np.array:
+        """ method returning mean squared displacement <|x(t + lag) - x(t)|^2> for lags 1, ..., <max_lag>.
+        Args:
+            max_lag (int): maximal time lag. Defaults to 100.
+        Returns:
+            (np.array): msd[lag - 1] for lag in 1, ..., max_lag.
+        """
+        if not self.shape:
+            raise ValueError("msd requires coordinates, trajectory stores node ids")
+
+        max_lag = min(max_lag, len(self) - 1)
+
+        def compute():
+            positions = self.positions.astype(np.float64)
+            return np.array([np.mean(np.sum((positions[lag:] - positions[:-lag]) ** 2, axis=1))
+                             for lag in range(1, max_lag + 1)])
+
+        return self._cached(('msd', max_lag), compute)
+
+    def occupation_counts(self) -> tuple[np.array, np.array]:
+        """ method returning visited positions (their labels if there are labels) and number of visits of each of
+            them.
+        Returns:
+            (tuple[np.array, np.array]): unique positions, number of visits.
+        """
+        def compute():
+            positions, counts = np.unique(self.positions, axis=0, return_counts=True)
+            if self.labels is None:
+                return positions, counts
+            # sorted by the labels, as OccupationObserver
+            labels = self.labels[positions]
+            order = np.argsort(labels, kind='stable')
+            return labels[order], counts[order]
+
+        return self._cached('occupation', compute)
+
+    def return_times(self, position=None) -> np.array:
+        """ method returning times between consecutive visits of <position>.
+        Args:
+            position: investigated position (label if there are labels). Defaults to None, i.e. starting position.
+        Returns:
+            (np.array): times between consecutive visits.
+        """
+        if position is not None and self.labels is not None:
+            position = self.labels.tolist().index(position)
+        position = self.positions[0] if position is None else np.asarray(position, dtype=self.dtype)
+
+        def compute():
+            visits = np.all((self.positions == position).reshape(len(self), -1), axis=1)
+            return np.diff(np.flatnonzero(visits))
+
+        return self._cached(('return_times', position.tobytes()), compute)
@@ -1,11 +1,22 @@
 from list_5.models.sir_model import total_infected_vs_r0, SIR_visualiser, phase_portrait_visualiser, solver, si_model,\
-    sir_model
+    sir_model, batch_solver, final_size, peak_infection, dense_solver, \
+    degree_block_solver
+from list_5.models.network_sir import network_sir
+from list_5.models.vector_field import VectorField, phase_portrait_explorer
 
 __all__ = [total_infected_vs_r0,
            SIR_visualiser,
            phase_portrait_visualiser,
            solver,
            si_model,
-           sir_model]
+           sir_model,
+           batch_solver,
+           final_size,
+           peak_infection,
+           dense_solver,
+           network_sir,
+           degree_block_solver,
+           VectorField,
+           phase_portrait_explorer]
 
 
@@ -0,0 +1,113 @@
+import heapq
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+SUSCEPTIBLE, INFECTED, REMOVED = 0, 1, 2
+TRANSMISSION, RECOVERY = 0, 1
+
+
+def _single_run(indptr: np.array, indices: np.array, initial: np.array, t: np.array, r: float, beta: float,
+                rng: np.random.Generator) -> np.array:
+    """ function running a single event-driven SIR epidemic on CSR adjacency (see network_sir). """
+    n = len(indptr) - 1
+    t_max = t[-1]
+
+    status = np.full(n, SUSCEPTIBLE, dtype=np.int8)
+    # earliest already scheduled transmission to each node; later ones are not queued at all
+    predicted_infection = np.full(n, np.inf)
+
+    queue = [(t[0], TRANSMISSION, node) for node in initial.tolist()]
+    predicted_infection[initial] = t[0]
+    heapq.heapify(queue)
+
+    counts = [n, 0, 0]
+    result = np.empty((len(t), 3))
+    k = 0
+
+    while queue:
+        time, kind, node = heapq.heappop(queue)
+
+        # counts are constant between events
+        while k < len(t) and t[k] < time:
+            result[k] = counts
+            k += 1
+
+        if kind == RECOVERY:
+            status[node] = REMOVED
+            counts[1] -= 1
+            counts[2] += 1
+            continue
+
+        # stale transmission (node already infected)
+        if status[node] != SUSCEPTIBLE:
+            continue
+
+        status[node] = INFECTED
+        counts[0] -= 1
+        counts[1] += 1
+
+        recovery_time = time + rng.exponential(1 / r) if r > 0 else np.inf
+        if recovery_time <= t_max:
+            heapq.heappush(queue, (recovery_time, RECOVERY, node))
+
+        # transmissions along the edges which happen before recovery of the node
+        neighbours = indices[indptr[node]:indptr[node + 1]]
+        transmission_times = time + rng.exponential(1 / beta, size=len(neighbours)) if beta > 0 else \
+            np.full(len(neighbours), np.inf)
+        valid = (transmission_times < recovery_time) & (transmission_times <= t_max) & \
+                (status[neighbours] == SUSCEPTIBLE) & (transmission_times < predicted_infection[neighbours])
+
+        for neighbour, transmission_time in zip(neighbours[valid].tolist(), transmission_times[valid].tolist()):
+            predicted_infection[neighbour] = transmission_time
+            heapq.heappush(queue, (transmission_time, TRANSMISSION, neighbour))
+
+    result[k:] = counts
+    return result
+
+
+def network_sir(network: 'nx.Graph', t: np.array, r: float, beta: float, initial_infected: int | list = 1,
+                replicas: int = 1, seed: int | None = None) -> np.array:
+    """ stochastic continuous-time SIR epidemic on the network. Event-driven (next-reaction) simulation with
+        a priority queue of transmission and recovery events over CSR adjacency: each infected node draws its
+        recovery time and transmission times to its neighbours, only transmissions earlier than the recovery and
+        earlier than already scheduled infection of the neighbour are queued. Cost O(events * log(N)).
+        SI model is the special case r = 0.
+    Args:
+        network (nx.Graph): contact network (e.g. list_3 generators or LiveJournal network).
+        t (np.array): sorted times at which S, I and R are reported.
+        r (float): recovery rate of the infected node.
+        beta (float): transmission rate along each edge.
+        initial_infected (int | list): number of randomly chosen initially infected nodes or list of them.
+                                       Defaults to 1.
+        replicas (int): number of independent epidemics. Defaults to 1.
+        seed (int | None): seed of the random generator (replicas use independent spawned streams).
+    Returns:
+        np.array: (replicas, len(t), 3) numbers of S, I and R
+    """
+    if beta < 0 or r < 0:
+        raise ValueError("beta and r shall be >= 0")
+
+    # list_3 (and networkx) are imported on the first use, not by every solver worker importing list_5
+    from list_3.models import to_csr
+
+    nodes, indptr, indices = to_csr(network)
+    t = np.asarray(t, dtype=float)
+
+    if isinstance(initial_infected, int):
+        fixed_initial = None
+    else:
+        node_index = {node: i for i, node in enumerate(nodes)}
+        fixed_initial = np.array([node_index[node] for node in initial_infected], dtype=np.int64)
+
+    results = np.empty((replicas, len(t), 3))
+    for replica, sequence in enumerate(np.random.SeedSequence(seed).spawn(replicas)):
+        rng = np.random.default_rng(sequence)
+        initial = rng.choice(len(nodes), size=initial_infected, replace=False) if fixed_initial is None else \
+            fixed_initial
+        results[replica] = _single_run(indptr, indices, initial, t, r, beta, rng)
+
+    return results
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import numpy as np
-from scipy.integrate import odeint
-import matplotlib.pyplot as plt
+
+if TYPE_CHECKING:
+    # only for the annotations - networkx is not imported by the solvers (and their worker processes)
+    import networkx as nx
 
 
 def dS_over_t(beta, S, I):
@@ -78,22 +80,242 @@ def si_model(Y, t, r: float, beta: float) -> np.array:
     return np.array([dS_over_t(beta, S, I), dI_over_t(beta, S, I, r)])
 
 
-def solver(model: callable, Y_0: tuple[int, int, Optional[int]], t: np.array, r: float, beta: float):
-    """ sovler of the system of equations
+def _sir_rhs(Y, t, r, beta):
+    """ SIR model without validation (parameters are validated once by solver). """
+    S, I, R = Y
+    infections = beta * S * I
+    return -infections, infections - r * I, r * I
+
+
+def _sir_jacobian(Y, t, r, beta):
+    """ analytic Jacobian of SIR model. """
+    S, I, R = Y
+    return np.array([[-beta * I, -beta * S, 0],
+                     [beta * I, beta * S - r, 0],
+                     [0, r, 0]])
+
+
+def _si_rhs(Y, t, r, beta):
+    """ SI model without validation (parameters are validated once by solver). """
+    S, I = Y
+    infections = beta * S * I
+    return -infections, infections - r * I
+
+
+def _si_jacobian(Y, t, r, beta):
+    """ analytic Jacobian of SI model. """
+    S, I = Y
+    return np.array([[-beta * I, -beta * S],
+                     [beta * I, beta * S - r]])
+
+
+# model: (fast right-hand side, Jacobian)
+FAST_MODELS = {sir_model: (_sir_rhs, _sir_jacobian),
+               si_model: (_si_rhs, _si_jacobian)}
+
+
+def validate_parameters(Y_0: tuple, r: float, beta: float) -> None:
+    """ function checking initial conditions and parameters of SI / SIR model (the same conditions as in the
+        models). """
+    if any(not isinstance(it, (int, float, np.integer, np.floating)) for it in Y_0):
+        raise ValueError("parameters S, I and R shall be int or float")
+    elif (not isinstance(r, (int, float, np.integer, np.floating))) or (not 0 <= r):
+        raise ValueError("r shall be float bigger than 0")
+    elif not isinstance(beta, (int, float, np.integer, np.floating)):
+        raise ValueError("beta shall be float")
+
+
+def solver(model: callable, Y_0: tuple[int, int, Optional[int]], t: np.array, r: float, beta: float,
+           method: Optional[str] = None, **kwargs):
+    """ sovler of the system of equations. Parameters are validated once, then sir_model / si_model are integrated
+        with their validation-free right-hand side - skipping the validation in every call is the whole speed-up.
+        The analytic Jacobian is passed as well, but it does not reduce the number of evaluations: LSODA stays in
+        the non-stiff mode on SIR / SI (no Jacobian evaluated) and Radau / BDF need only a few Jacobians.
     Args:
         model (callable): function (basically SI or SIR model)
         Y_0 (tuple[int, int, Optional[int]]): initial conditions of S, I (and optional R for SIR model)
         t (np.array): time
         r (float): function parameter
         beta (float): function parameter
+        method (Optional[str]): None for odeint (LSODA), otherwise scipy.integrate.solve_ivp method, e.g. stiff
+                                'Radau' or 'BDF'. Defaults to None.
+        **kwargs: Optional arguments for odeint() / solve_ivp() function.
+    Returns:
+        np.array: (len(t), len(Y_0)) solution
+    """
+    from scipy.integrate import odeint, solve_ivp
+
+    if model in FAST_MODELS:
+        validate_parameters(Y_0, r, beta)
+        model, jacobian = FAST_MODELS[model]
+    else:
+        jacobian = None
+
+    if method is None:
+        return odeint(model, Y_0, t, args=(r, beta), Dfun=jacobian, **kwargs)
+
+    kwargs.setdefault('rtol', 1.49012e-8)
+    kwargs.setdefault('atol', 1.49012e-8)
+    if jacobian is not None and method in ('Radau', 'BDF', 'LSODA'):
+        kwargs['jac'] = lambda time, y: jacobian(y, time, r, beta)
+
+    result = solve_ivp(lambda time, y: model(y, time, r, beta), (t[0], t[-1]), Y_0, method=method, t_eval=t,
+                       **kwargs)
+    return result.y.T
+
+
+def sir_model_batch(Y: np.array, t: float, r: np.array, beta: np.array) -> np.array:
+    """ SIR model for K parameter sets at once (no validation).
+    Args:
+        Y (np.array): (3, K) array of S, I and R
+        t (float): time
+        r (np.array): (K,) recovery rates
+        beta (np.array): (K,) parameters of infectivity
     Returns:
+        np.array: (3, K) derivatives of S, I and R
+    """
+    S, I, R = Y
+    return np.array([dS_over_t(beta, S, I), dI_over_t(beta, S, I, r), dR_over_t(r, I)])
+
 
+def si_model_batch(Y: np.array, t: float, r: np.array, beta: np.array) -> np.array:
+    """ SI model for K parameter sets at once (no validation).
+    Args:
+        Y (np.array): (2, K) array of S and I
+        t (float): time
+        r (np.array): (K,) recovery rates
+        beta (np.array): (K,) parameters of infectivity
+    Returns:
+        np.array: (2, K) derivatives of S and I
     """
-    return odeint(model, Y_0, t, args=(r, beta))
+    S, I = Y
+    return np.array([dS_over_t(beta, S, I), dI_over_t(beta, S, I, r)])
+
+
+BATCH_MODELS = {sir_model: sir_model_batch,
+                si_model: si_model_batch}
+
+
+def batch_solver(model: callable, Y_0: np.array, t: np.array, r: np.array, beta: np.array,
+                 method: str = 'RK45', **kwargs) -> np.array:
+    """ solver of the system of equations for K parameter sets integrated together with one vectorized right-hand
+        side of shape (3K,) (or (2K,) for SI model).
+    Args:
+        model (callable): sir_model or si_model (or its batch version)
+        Y_0 (np.array): (K, 3) or (K, 2) initial conditions; single initial condition is broadcast to all K sets
+        t (np.array): time
+        r (np.array): (K,) recovery rates (scalar is broadcast)
+        beta (np.array): (K,) parameters of infectivity (scalar is broadcast)
+        method (str): 'rk4' for fixed step Runge-Kutta on the grid <t> or any scipy.integrate.solve_ivp method.
+                      Defaults to 'RK45'.
+        **kwargs: Optional arguments for scipy.integrate.solve_ivp() function, e.g. rtol, atol.
+    Returns:
+        np.array: (K, T, 3) or (K, T, 2) solutions, T = len(t)
+    """
+    from scipy.integrate import solve_ivp
+
+    model = BATCH_MODELS.get(model, model)
+    r, beta = np.atleast_1d(np.asarray(r, dtype=float)), np.atleast_1d(np.asarray(beta, dtype=float))
+    Y_0 = np.atleast_2d(np.asarray(Y_0, dtype=float))
+
+    k = max(len(r), len(beta), len(Y_0))
+    r, beta = np.broadcast_to(r, (k,)), np.broadcast_to(beta, (k,))
+    Y_0 = np.broadcast_to(Y_0, (k, Y_0.shape[1]))
+    n = Y_0.shape[1]
+    t = np.asarray(t, dtype=float)
+
+    if method == 'rk4':
+        solution = np.empty((len(t), n, k))
+        y = Y_0.T.copy()
+        solution[0] = y
+        for i, dt in enumerate(np.diff(t)):
+            k1 = model(y, t[i], r, beta)
+            k2 = model(y + dt / 2 * k1, t[i] + dt / 2, r, beta)
+            k3 = model(y + dt / 2 * k2, t[i] + dt / 2, r, beta)
+            k4 = model(y + dt * k3, t[i] + dt, r, beta)
+            y = y + dt / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            solution[i + 1] = y
+        return solution.transpose(2, 0, 1)
+
+    # state is flattened as (S_1..S_K, I_1..I_K, R_1..R_K)
+    def rhs(time, y):
+        return model(y.reshape(n, k), time, r, beta).reshape(-1)
+
+    kwargs.setdefault('rtol', 1.49012e-8)
+    kwargs.setdefault('atol', 1.49012e-8)
+    result = solve_ivp(rhs, (t[0], t[-1]), Y_0.T.reshape(-1), method=method, t_eval=t, **kwargs)
+    return result.y.reshape(n, k, len(t)).transpose(1, 2, 0)
+
+
+def degree_classes(network: 'nx.Graph | dict') -> tuple[np.array, np.array]:
+    """ function grouping nodes of the <network> by degree.
+    Args:
+        network (nx.Graph | dict): graph or degree histogram {degree: number of nodes}
+    Returns:
+        (tuple[np.array, np.array]): degree classes k, number of nodes of each class
+    """
+    if isinstance(network, dict):
+        degrees = np.array(sorted(network))
+        return degrees, np.array([network[k] for k in degrees])
+    return np.unique([degree for _, degree in network.degree()], return_counts=True)
+
+
+def degree_block_sir_model(Y: np.array, t: float, k: np.array, p_k: np.array, r: float, beta: float) -> np.array:
+    """ heterogeneous mean-field SIR model (no validation). Nodes of degree k are infected with rate
+        beta * k * theta, theta - probability that an edge points to an infected node.
+    Args:
+        Y (np.array): (3m,) densities s_k, i_k, r_k of m degree classes (s_1..s_m, i_1..i_m, r_1..r_m)
+        t (float): time
+        k (np.array): (m,) degree classes
+        p_k (np.array): (m,) fraction of nodes in each class
+        r (float): recovery rate
+        beta (float): parameter of infectivity (per edge)
+    Returns:
+        np.array: (3m,) derivatives
+    """
+    s, i, _ = Y.reshape(3, -1)
+    theta = np.dot(k * p_k, i) / np.dot(k, p_k)
+    infections = beta * k * s * theta
+    return np.concatenate([-infections, infections - r * i, r * i])
+
+
+def degree_block_solver(network: 'nx.Graph | dict', t: np.array, r: float, beta: float, I0: int = 1,
+                        return_classes: bool = False):
+    """ solver of heterogeneous mean-field (degree-block) SIR model for the degree distribution of the <network>.
+        Cost per step is O(number of degree classes), not O(number of nodes).
+    Args:
+        network (nx.Graph | dict): graph (e.g. from list_3.models.graphs) or degree histogram {degree: number of
+                                   nodes}
+        t (np.array): time
+        r (float): recovery rate
+        beta (float): parameter of infectivity (per edge)
+        I0 (int): number of initially infected nodes, spread uniformly over the degree classes. Defaults to 1.
+        return_classes (bool): return also densities of each class. Defaults to False.
+    Returns:
+        np.array: (len(t), 3) numbers of S, I and R (and (len(t), 3, m) densities s_k, i_k, r_k, k if
+                  <return_classes>)
+    """
+    from scipy.integrate import odeint
+
+    validate_parameters((I0,), r, beta)
+    k, counts = degree_classes(network)
+    n = counts.sum()
+    p_k = counts / n
+
+    i_0 = np.full(len(k), I0 / n)
+    Y_0 = np.concatenate([1 - i_0, i_0, np.zeros(len(k))])
+    densities = odeint(degree_block_sir_model, Y_0, t, args=(k, p_k, r, beta)).reshape(len(t), 3, len(k))
+
+    totals = n * densities @ p_k
+    if return_classes:
+        return totals, densities, k
+    return totals
 
 
 def SIR_visualiser(solution, t, r, beta, S0, I0, R0):
     """ function visualising SIR model """
+    import matplotlib.pyplot as plt
+
     S = solution[:, 0]
     I = solution[:, 1]
     R = solution[:, 2]
@@ -116,6 +338,8 @@ def SIR_visualiser(solution, t, r, beta, S0, I0, R0):
 
 def phase_portrait_visualiser(solution, r, beta, S0, I0, R0, arrow_density=30):
     """ function creating phase portrait for numeric solution """
+    import matplotlib.pyplot as plt
+
     S = solution[:, 0]
     I = solution[:, 1]
 
@@ -123,7 +347,7 @@ def phase_portrait_visualiser(solution, r, beta, S0, I0, R0, arrow_density=30):
     # create subset of S and I with bigger intervals
     S_t, I_t = np.meshgrid(np.linspace(min(S), max(S), arrow_density), np.linspace(min(I), max(I), arrow_density))
     # get derivatives
-    dS_t, dI_t = si_model((S_t, I_t), 0, r, beta)
+    dS_t, dI_t = si_model_batch(np.array([S_t, I_t]), 0, r, beta)
     dS_t, dI_t = normalize_vector_length(dS_t, dI_t)
 
     plt.figure(figsize=(7, 7))
@@ -138,23 +362,124 @@ def phase_portrait_visualiser(solution, r, beta, S0, I0, R0, arrow_density=30):
     return
 
 
-def total_infected_vs_r0(t: np.array, S0: tuple, I0: tuple, R0: tuple, r: tuple, beta: tuple):
+def final_size(S0, I0, R0, r, beta) -> dict:
+    """ function solving SIR final-size relation S_inf = S0 * exp(-beta / r * (N - R0 - S_inf)) with Lambert W
+        closed form (no ODE is integrated). Works elementwise for arrays of parameters.
+    Args:
+        S0, I0, R0 (float | np.array): initial conditions
+        r (float | np.array): recovery rate
+        beta (float | np.array): parameter of infectivity
+    Returns:
+        (dict): S_inf, R_inf (total removed at t -> inf), total_infected (R_inf - R0) and peak_infected (maximal
+                I(t), from the first integral I + S - r / beta * ln(S) = const)
+    """
+    from scipy.special import lambertw
+
+    S0, I0, R0, r, beta = (np.asarray(it, dtype=float) for it in (S0, I0, R0, r, beta))
+    N = S0 + I0 + R0
+    rho = r / beta
+
+    S_inf = -rho * np.real(lambertw(-S0 / rho * np.exp(-(N - R0) / rho)))
+    R_inf = N - S_inf
+
+    # I is maximal when S = rho (or at t = 0 if S0 <= rho already)
+    peak_infected = np.where(S0 > rho, I0 + S0 - rho * (1 + np.log(S0 / rho)), I0)[()]
+
+    return {'S_inf': S_inf, 'R_inf': R_inf, 'total_infected': R_inf - R0, 'peak_infected': peak_infected}
+
+
+def peak_infection(Y_0: tuple, r: float, beta: float, t_max: float = 1e4, **kwargs) -> tuple[float, float]:
+    """ function returning time and height of the SIR infection peak found by solver event dI/dt = 0 (i.e.
+        beta * S = r). The integration stops at the event.
+    Args:
+        Y_0 (tuple): initial conditions of S, I and R
+        r (float): recovery rate
+        beta (float): parameter of infectivity
+        t_max (float): integration limit if the peak is not reached. Defaults to 1e4.
+        **kwargs: Optional arguments for scipy.integrate.solve_ivp() function.
+    Returns:
+        (tuple[float, float]): peak time, peak height (0 and I(0) if the epidemic does not grow)
+    """
+    from scipy.integrate import solve_ivp
+
+    validate_parameters(Y_0, r, beta)
+    if beta * Y_0[0] <= r:
+        return 0., float(Y_0[1])
+
+    def peak_event(time, y):
+        return beta * y[0] - r
+    peak_event.terminal = True
+    peak_event.direction = -1
+
+    kwargs.setdefault('rtol', 1.49012e-8)
+    kwargs.setdefault('atol', 1.49012e-8)
+    result = solve_ivp(lambda time, y: _sir_rhs(y, time, r, beta), (0, t_max), Y_0, method='LSODA',
+                       jac=lambda time, y: _sir_jacobian(y, time, r, beta), events=peak_event, **kwargs)
+
+    if not len(result.t_events[0]):
+        return np.nan, np.nan
+    return float(result.t_events[0][0]), float(result.y_events[0][0][1])
+
+
+def dense_solver(model: callable, Y_0: tuple, t: np.array, r: float, beta: float, resolution: int = 500,
+                 method: str = 'LSODA', **kwargs) -> tuple[np.array, np.array]:
+    """ solver with dense output evaluated only at <resolution> points of the time range of <t> (adaptive steps
+        are not forced onto the whole dense grid <t>).
+    Args:
+        model (callable): sir_model or si_model
+        Y_0 (tuple): initial conditions
+        t (np.array): time (only t[0] and t[-1] are used)
+        r (float): function parameter
+        beta (float): function parameter
+        resolution (int): number of returned time points. Defaults to 500.
+        method (str): scipy.integrate.solve_ivp method. Defaults to 'LSODA'.
+        **kwargs: Optional arguments for scipy.integrate.solve_ivp() function.
+    Returns:
+        (tuple[np.array, np.array]): time points of shape (resolution,), solution of shape (resolution, len(Y_0))
+    """
+    from scipy.integrate import solve_ivp
+
+    if model in FAST_MODELS:
+        validate_parameters(Y_0, r, beta)
+        model, jacobian = FAST_MODELS[model]
+        if method in ('Radau', 'BDF', 'LSODA'):
+            kwargs['jac'] = lambda time, y: jacobian(y, time, r, beta)
+
+    kwargs.setdefault('rtol', 1.49012e-8)
+    kwargs.setdefault('atol', 1.49012e-8)
+    result = solve_ivp(lambda time, y: model(y, time, r, beta), (t[0], t[-1]), Y_0, method=method,
+                       dense_output=True, **kwargs)
+
+    t_plot = np.linspace(t[0], t[-1], resolution)
+    return t_plot, result.sol(t_plot).T
+
+
+def total_infected_vs_r0(t: np.array, S0: tuple, I0: tuple, R0: tuple, r: tuple, beta: tuple, mode: str = 'ode'):
+    """ function plotting total infected (maximal R(t)) against theoretical R_0 for given parameter sets.
+    Args:
+        t (np.array): time (not used in 'final_size' mode)
+        S0, I0, R0 (tuple): initial conditions
+        r (tuple): recovery rates
+        beta (tuple): parameters of infectivity
+        mode (str): 'ode' - all parameter sets integrated together on <t>, 'final_size' - final-size relation
+                    (t -> inf) without integration. Defaults to 'ode'.
+    """
+    import matplotlib.pyplot as plt
+
     n = len(S0)
 
     if  n != len(R0) != len(I0) != len(r) != len(beta):
         raise ValueError('initial conditions vectors shall have the same length!')
 
-    total_infected_vector = []
-    R0_vector = []
-
-    for i in range(n):
-        R0_th = R_0(beta[i], r[i], S0[i])
-        R0_vector.append(R0_th)
+    R0_vector = R_0(np.asarray(beta), np.asarray(r), np.asarray(S0))
 
-        Y0 = (S0[i], I0[i], R0[i])
-        solution = odeint(sir_model, Y0, t, args=(r[i], beta[i]))
-        total_infected = max(solution[:, 2])
-        total_infected_vector.append(total_infected)
+    if mode == 'final_size':
+        total_infected_vector = final_size(S0, I0, R0, r, beta)['R_inf']
+    else:
+        # all parameter sets integrated together
+        Y0 = np.column_stack([S0, I0, R0])
+        solution = batch_solver(sir_model, Y0, t, r, beta)
+        total_infected_vector = solution[:, :, 2].max(axis=1)
 
     plt.figure(figsize=(14, 7))
     plt.scatter(R0_vector, total_infected_vector)
@@ -0,0 +1,126 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from list_5.models.sir_model import BATCH_MODELS, batch_solver, normalize_vector_length, si_model, sir_model
+
+# model: number of variables
+MODEL_DIMENSIONS = {sir_model: 3, si_model: 2}
+
+
+class VectorField:
+    """ Vectorized evaluator of SI / SIR vector fields on regular 2D / 3D grids with LRU cache of the fields.
+
+    Grid is given as a tuple of (start, stop, num) for each variable (S, I[, R]) - the same as for np.linspace, so it
+    is hashable and can be a part of the cache key. Missing variables (e.g. R for the S-I projection of SIR model) are
+    set to 0; they do not enter the derivatives of S and I anyway.
+
+    Attributes:
+        maxsize (int): maximal number of cached fields. Defaults to 128.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+
+    @staticmethod
+    def mesh(grid: tuple) -> list[np.array]:
+        """ method returning meshgrid (indexing 'xy') of the <grid>. """
+        return np.meshgrid(*[np.linspace(*axis) for axis in grid])
+
+    def evaluate(self, model: callable, grid: tuple, r: float, beta: float) -> np.array:
+        """ method evaluating derivatives of <model> at every point of the <grid> in one vectorized call.
+        Args:
+            model (callable): sir_model or si_model
+            grid (tuple): ((start, stop, num) for S, (start, stop, num) for I[, (start, stop, num) for R])
+            r (float): recovery rate
+            beta (float): parameter of infectivity
+        Returns:
+            np.array: (dimension of the model, *mesh shape) derivatives; cached by (model, beta, r, grid)
+        """
+        key = (model, beta, r, tuple(map(tuple, grid)))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        variables = list(self.mesh(grid))
+        shape = variables[0].shape
+        variables += [np.zeros(shape)] * (MODEL_DIMENSIONS[model] - len(variables))
+
+        points = np.stack([it.ravel() for it in variables])
+        field = BATCH_MODELS[model](points, 0, r, beta).reshape((-1,) + shape)
+
+        self._cache[key] = field
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return field
+
+    def nullclines(self, model: callable, grid: tuple, r: float, beta: float) -> list[list[np.array]]:
+        """ method returning nullclines of a 2D field (zero-level lines of dS/dt and dI/dt) traced on the <grid>.
+        Returns:
+            (list[list[np.array]]): for each of dS/dt, dI/dt list of (n, 2) polylines in (S, I) coordinates
+        """
+        import contourpy
+
+        S, I = self.mesh(grid[:2])
+        field = self.evaluate(model, grid[:2], r, beta)
+        return [contourpy.contour_generator(S, I, component).lines(0) for component in field[:2]]
+
+    @staticmethod
+    def streamlines(model: callable, seeds: np.array, t: np.array, r: float, beta: float) -> np.array:
+        """ method integrating streamlines from all <seeds> together (vectorized fixed step RK4).
+        Args:
+            model (callable): sir_model or si_model
+            seeds (np.array): (M, dimension of the model) starting points
+            t (np.array): time grid
+            r (float): recovery rate
+            beta (float): parameter of infectivity
+        Returns:
+            np.array: (M, len(t), dimension of the model) streamlines
+        """
+        seeds = np.asarray(seeds, dtype=float)
+        return batch_solver(model, seeds, t, np.full(len(seeds), r), np.full(len(seeds), beta), method='rk4')
+
+
+def phase_portrait_explorer(model: callable = si_model, grid: tuple = ((0, 100, 30), (0, 100, 30)),
+                            r: float = 0.8, beta: float = 0.02, r_range: tuple = (0, 2), beta_range: tuple = (0, 0.1),
+                            vector_field: VectorField | None = None):
+    """ function creating interactive S-I phase portrait with sliders over <r> and <beta>. Only arrows and nullclines
+        are updated on the slider change, fields are taken from VectorField cache.
+    Returns:
+        (tuple[Slider, Slider]): sliders (references have to be kept for the sliders to stay responsive)
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.widgets import Slider
+
+    vector_field = vector_field or VectorField()
+    S, I = vector_field.mesh(grid[:2])
+
+    figure, ax = plt.subplots(figsize=(7, 8))
+    figure.subplots_adjust(bottom=0.2)
+    with np.errstate(invalid='ignore'):
+        arrows = ax.quiver(S, I, *normalize_vector_length(*vector_field.evaluate(model, grid[:2], r, beta)[:2]))
+    lines = []
+    ax.set_xlabel('S(t)')
+    ax.set_ylabel('I(t)')
+
+    r_slider = Slider(figure.add_axes([0.15, 0.08, 0.7, 0.03]), 'r', *r_range, valinit=r)
+    beta_slider = Slider(figure.add_axes([0.15, 0.03, 0.7, 0.03]), 'beta', *beta_range, valinit=beta)
+
+    def update(_):
+        field = vector_field.evaluate(model, grid[:2], r_slider.val, beta_slider.val)
+        with np.errstate(invalid='ignore'):
+            arrows.set_UVC(*normalize_vector_length(*field[:2]))
+
+        for line in lines:
+            line.remove()
+        lines.clear()
+        for color, component in zip(['b', 'r'], vector_field.nullclines(model, grid, r_slider.val, beta_slider.val)):
+            for polyline in component:
+                lines.extend(ax.plot(polyline[:, 0], polyline[:, 1], f'{color}--'))
+        figure.canvas.draw_idle()
+
+    r_slider.on_changed(update)
+    beta_slider.on_changed(update)
+    update(None)
+    return r_slider, beta_slider
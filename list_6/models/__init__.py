@@ -1,7 +1,26 @@
-from list_6.models.q_voter import QVoter
+from list_6.models.q_voter import QVoter, ArrayQVoter
+from list_6.models.aggregators import MagnetizationAggregator
+from list_6.models.fast_q_voter import FastQVoter
+from list_6.models.replica_q_voter import ReplicaQVoter
+from list_6.models.kinetic_q_voter import KineticQVoter
+from list_6.models.mean_field_q_voter import MeanFieldQVoter
+from list_6.models.sweep import GraphSpec, run_sweep, load_sweep
+from list_6.models.critical_point import Estimate, estimate, find_critical_point
 
 
 __all__ = [
-    QVoter
+    QVoter,
+    ArrayQVoter,
+    MagnetizationAggregator,
+    FastQVoter,
+    ReplicaQVoter,
+    KineticQVoter,
+    MeanFieldQVoter,
+    GraphSpec,
+    run_sweep,
+    load_sweep,
+    Estimate,
+    estimate,
+    find_critical_point
            ]
 
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class MagnetizationAggregator:
+    """ Streaming aggregation of magnetization m(t) over Monte Carlo runs, so the trajectories do not have to be
+    stored. Memory is O(T / every) regardless of the number of runs.
+
+    m(t) is sampled after every <every>-th event (every N events = one Monte Carlo sweep). For each sampled time
+    running mean and variance across runs are kept (Chan et al. merge of Welford's moments). Histogram of |m| is
+    collected from samples at times >= <steady_state_from>.
+
+    Attributes:
+        every (int): sampling interval in events. Defaults to 1.
+        steady_state_from (int | None): first event of the steady state used by histogram. Defaults to None (no
+                                        histogram).
+        bins (int): number of bins of the |m| histogram over [0, 1]. Defaults to 50.
+    """
+
+    def __init__(self, every: int = 1, steady_state_from: int | None = None, bins: int = 50):
+        self.every = every
+        self.steady_state_from = steady_state_from
+        self.bins = bins
+
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self._m2 = np.zeros(0)
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.bin_edges = np.linspace(0, 1, bins + 1)
+
+    @classmethod
+    def per_sweep(cls, network_size: int, **kwargs) -> 'MagnetizationAggregator':
+        """ method creating aggregator sampling once per Monte Carlo sweep (<network_size> events). """
+        return cls(every=network_size, **kwargs)
+
+    def _grow(self, size: int):
+        if size > len(self.count):
+            extra = size - len(self.count)
+            self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+            self.mean = np.concatenate([self.mean, np.zeros(extra)])
+            self._m2 = np.concatenate([self._m2, np.zeros(extra)])
+
+    def update(self, magnetization: np.array, start: int = 0) -> None:
+        """ method updating statistics with a block of magnetization.
+        Args:
+            magnetization (np.array): (runs, B) or (B,) magnetization after events start, ..., start + B - 1.
+            start (int): index of the first event of the block. Defaults to 0.
+        """
+        magnetization = np.atleast_2d(magnetization)
+        events = np.arange(start, start + magnetization.shape[1])
+
+        # samples after each <every>-th event
+        sampled = (events + 1) % self.every == 0
+        values, samples = magnetization[:, sampled], (events[sampled] + 1) // self.every - 1
+        if not len(samples):
+            return
+        self._grow(samples[-1] + 1)
+
+        runs = len(values)
+        chunk_mean = values.mean(axis=0)
+        chunk_m2 = ((values - chunk_mean) ** 2).sum(axis=0)
+
+        count, mean = self.count[samples], self.mean[samples]
+        total = count + runs
+        delta = chunk_mean - mean
+        self.mean[samples] = mean + delta * runs / total
+        self._m2[samples] += chunk_m2 + delta ** 2 * count * runs / total
+        self.count[samples] = total
+
+        if self.steady_state_from is not None:
+            steady = events[sampled] >= self.steady_state_from
+            self.histogram += np.histogram(np.abs(values[:, steady]), bins=self.bin_edges)[0]
+
+    @property
+    def times(self) -> np.array:
+        """ indices of the sampled events. """
+        return (np.arange(len(self.count)) + 1) * self.every - 1
+
+    @property
+    def var(self) -> np.array:
+        """ variance of m(t) across runs. """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._m2 / self.count
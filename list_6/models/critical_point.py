@@ -0,0 +1,152 @@
+from dataclasses import dataclass
+
+import networkx as nx
+import numpy as np
+
+from list_6.models.replica_q_voter import ReplicaQVoter
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """ Steady state estimates of the q-voter model at a single p (errors from jackknife over the replicas).
+    Attributes:
+        network_size (int): number of spinsons N.
+        p (float): probability of independence.
+        abs_magnetization (float): <|m|>.
+        susceptibility (float): N * (<m^2> - <|m|>^2).
+        binder (float): Binder cumulant 1 - <m^4> / (3 <m^2>^2).
+        num_of_events (int): number of simulated events (all replicas).
+    """
+    network_size: int
+    p: float
+    abs_magnetization: float
+    abs_magnetization_error: float
+    susceptibility: float
+    susceptibility_error: float
+    binder: float
+    binder_error: float
+    num_of_events: int
+
+
+def _jackknife(moments: np.array, statistic) -> tuple[float, float]:
+    """ function returning value and jackknife error of <statistic> of the replica averages of <moments>.
+    Args:
+        moments (np.array): (replicas, k) time averages of the moments in each replica.
+        statistic (callable): function of the k averaged moments.
+    """
+    replicas = len(moments)
+    value = statistic(moments.mean(axis=0))
+    if replicas < 2:
+        return value, np.inf
+    leave_one_out = (moments.sum(axis=0) - moments) / (replicas - 1)
+    values = np.array([statistic(row) for row in leave_one_out])
+    return value, float(np.sqrt((replicas - 1) / replicas * ((values - values.mean()) ** 2).sum()))
+
+
+def estimate(network: nx.Graph, p: float, q: int, num_of_sweeps: int = 200, replicas: int = 20,
+             burn_in: float = 0.5, seed: int | np.random.SeedSequence | None = None) -> Estimate:
+    """ function estimating <|m|>, susceptibility and Binder cumulant of the q-voter model with NN influence group.
+        Magnetization is sampled once per Monte Carlo sweep after the <burn_in> fraction of the run.
+    Args:
+        network (nx.Graph): network of the spinsons.
+        p (float): probability of independence.
+        q (int): number of people in the influence group
+        num_of_sweeps (int): length of each run in Monte Carlo sweeps (N events). Defaults to 200.
+        replicas (int): number of independent runs. Defaults to 20.
+        burn_in (float): discarded fraction of each run. Defaults to 0.5.
+        seed (int | np.random.SeedSequence | None): seed of the random generator.
+    Returns:
+        (Estimate): estimates with their errors.
+    """
+    n = network.number_of_nodes()
+    # only (replicas, num_of_sweeps) samples are stored, so memory does not grow with N
+    magnetization = ReplicaQVoter(network, seed=seed).simulate(num_of_sweeps * n, p, q, replicas=replicas, every=n)
+    sweeps = magnetization[:, int(burn_in * num_of_sweeps):]
+
+    moments = np.stack([np.abs(sweeps).mean(axis=1), (sweeps ** 2).mean(axis=1), (sweeps ** 4).mean(axis=1)], axis=1)
+    abs_magnetization = _jackknife(moments, lambda m: m[0])
+    susceptibility = _jackknife(moments, lambda m: n * (m[1] - m[0] ** 2))
+    binder = _jackknife(moments, lambda m: 1 - m[2] / (3 * m[1] ** 2) if m[1] > 0 else 2 / 3)
+    return Estimate(n, p, *abs_magnetization, *susceptibility, *binder, num_of_events=num_of_sweeps * n * replicas)
+
+
+def _crossings(first: dict[float, Estimate], second: dict[float, Estimate]) -> list[tuple[float, float]]:
+    """ function returning intervals of p where Binder cumulants of two network sizes cross. Sign changes of the
+        difference within its errors at both ends (e.g. in the ordered or disordered phase) are not crossings. """
+    grid = sorted(first)
+    differences = [first[p].binder - second[p].binder for p in grid]
+    significant = [abs(differences[i]) > np.hypot(first[p].binder_error, second[p].binder_error)
+                   for i, p in enumerate(grid)]
+    return [(grid[i], grid[i + 1]) for i in range(len(grid) - 1)
+            if differences[i] * differences[i + 1] < 0 and (significant[i] or significant[i + 1])]
+
+
+def find_critical_point(networks: nx.Graph | list[nx.Graph], q: int, p_min: float = 0., p_max: float = 0.5,
+                        coarse: int = 11, precision: float = 0.005, seed: int = 0,
+                        **estimate_kwargs) -> tuple[float, list[Estimate]]:
+    """ function locating the critical point p_c of the q-voter model by adaptive refinement of the p-grid.
+
+        Estimates start from <coarse> points between <p_min> and <p_max>. With a single network the intervals next
+        to the maximum of the susceptibility are halved, with several networks (finite-size scaling) the intervals
+        where Binder cumulants of consecutive network sizes cross are halved, until they are shorter than
+        <precision>. Only the refined intervals get new simulations.
+    Args:
+        networks (nx.Graph | list[nx.Graph]): network or networks of different sizes.
+        q (int): number of people in the influence group
+        p_min (float): lower end of the coarse grid. Defaults to 0.
+        p_max (float): upper end of the coarse grid. Defaults to 0.5.
+        coarse (int): number of points of the coarse grid. Defaults to 11.
+        precision (float): length of the final interval around p_c. Defaults to 0.005.
+        seed (int): seed of the driver; each (network, p) is simulated with its own spawned SeedSequence.
+        **estimate_kwargs: num_of_sweeps, replicas, burn_in of estimate.
+    Returns:
+        (tuple[float, list[Estimate]]): p_c (peak of the susceptibility or mean of the Binder crossings) and all
+                                        the estimates sorted by network size and p.
+    """
+    if isinstance(networks, nx.Graph):
+        networks = [networks]
+    networks = sorted(networks, key=nx.Graph.number_of_nodes)
+    estimates = [{} for _ in networks]
+
+    def measure(points: list[float]):
+        for i, network in enumerate(networks):
+            for p in points:
+                if p not in estimates[i]:
+                    p_seed = np.random.SeedSequence(seed, spawn_key=(i, int(round(p * 1e9))))
+                    estimates[i][p] = estimate(network, p, q, seed=p_seed, **estimate_kwargs)
+
+    def intervals() -> list[tuple[float, float]]:
+        if len(networks) == 1:
+            grid = sorted(estimates[0])
+            peak = max(range(len(grid)), key=lambda i: estimates[0][grid[i]].susceptibility)
+            return [(grid[i], grid[i + 1]) for i in (peak - 1, peak) if 0 <= i < len(grid) - 1]
+        return [interval for first, second in zip(estimates, estimates[1:]) for interval in _crossings(first, second)]
+
+    measure(np.linspace(p_min, p_max, coarse).tolist())
+    # refinement stops when the intervals are short enough or the crossing is lost in the statistical errors
+    bracket = intervals()
+    while True:
+        to_refine = [(a, b) for a, b in bracket if b - a > precision]
+        if not to_refine:
+            break
+        measure([(a + b) / 2 for a, b in to_refine])
+        refined = intervals()
+        if not refined:
+            break
+        bracket = refined
+
+    if len(networks) == 1:
+        p_c = max(estimates[0], key=lambda p: estimates[0][p].susceptibility)
+    else:
+        # linear interpolation of the crossings of consecutive sizes within the last bracketing intervals
+        crossings = []
+        for first, second in zip(estimates, estimates[1:]):
+            for a, b in bracket:
+                grid = [p for p in sorted(first) if a <= p <= b]
+                for left, right in zip(grid, grid[1:]):
+                    d_a, d_b = first[left].binder - second[left].binder, first[right].binder - second[right].binder
+                    if d_a * d_b < 0:
+                        crossings.append(left + (right - left) * d_a / (d_a - d_b))
+        p_c = float(np.mean(crossings)) if crossings else np.nan
+
+    return p_c, [estimates[i][p] for i in range(len(networks)) for p in sorted(estimates[i])]
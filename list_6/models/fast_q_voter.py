@@ -0,0 +1,141 @@
+import networkx as nx
+import numpy as np
+
+from list_3.models import ConvergenceMonitor, to_csr
+from list_6.models.aggregators import MagnetizationAggregator
+
+
+def draw_panels(indptr: np.array, indices: np.array, spinsons: np.array, q: int, rng: np.random.Generator) -> np.array:
+    """ function drawing q-panels (with repetitions) of nearest neighbours of all <spinsons> at once from CSR
+        adjacency.
+    Returns:
+        (np.array): (len(spinsons), q) positions of the panel members (meaningless for spinsons without neighbours)
+    """
+    if not len(indices):
+        return np.zeros((len(spinsons), q), dtype=np.int32)
+
+    degrees = indptr[spinsons + 1] - indptr[spinsons]
+    offsets = (rng.random((len(spinsons), q)) * degrees[:, None]).astype(np.int64)
+    return indices[np.minimum(indptr[spinsons][:, None] + offsets, len(indices) - 1)]
+
+
+class FastQVoter:
+    """ Fast path of the q-voter model with NN influence group (the same semantics as QVoter, including repetitions
+    in the q-panel).
+
+    Random numbers are drawn in blocks of <block_size> events: spinsons, independence coins, flip coins and
+    neighbour offsets. The q-panels of the whole block are gathered at once from CSR adjacency, since they do not
+    depend on the opinions. Only the events which may change the state (independent flips and conformist events) are
+    processed one by one, magnetization of the others is filled by cumulative sum of the changes.
+
+    Spinsons without neighbours never conform (QVoter raises on them).
+
+    Attributes:
+        init_network (nx.Graph): network of the spinsons.
+        block_size (int): number of events drawn at once. Defaults to 100000.
+        seed (int | None): seed of the random generator.
+    """
+
+    def __init__(self, init_network: nx.Graph, block_size: int = 100000, seed: int | None = None):
+        self.init_network = init_network
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+
+        self.nodes, self.indptr, self.indices = to_csr(init_network)
+        self.degrees = np.diff(self.indptr)
+
+        self.operating_opinion = None
+        self.opinion_sum = 0
+
+    def reload_operating_opinion(self):
+        """ Method initializing opinion of the spinsons to 1. """
+        self.operating_opinion = np.ones(len(self.nodes), dtype=np.int8)
+        self.opinion_sum = len(self.nodes)
+
+    def simulate_block(self, size: int, p: float, q: int) -> np.array:
+        """ Method simulating <size> events.
+        Returns:
+            (np.array): sum of the opinions after each event
+        """
+        spinsons = self.rng.integers(len(self.nodes), size=size)
+        independent = self.rng.random(size) < p
+        flip = self.rng.random(size) < 0.5
+        panels = draw_panels(self.indptr, self.indices, spinsons, q, self.rng)
+
+        toggle = independent & flip
+        conform = ~independent & (self.degrees[spinsons] > 0)
+        candidates = np.flatnonzero(toggle | conform)
+
+        opinions = self.operating_opinion.tolist()
+        changed_events, changes = [], []
+        for event, spinson, is_toggle, panel in zip(candidates.tolist(), spinsons[candidates].tolist(),
+                                                    toggle[candidates].tolist(), panels[candidates].tolist()):
+            if is_toggle:
+                new_opinion = -opinions[spinson]
+            else:
+                new_opinion = opinions[panel[0]]
+                if new_opinion == opinions[spinson]:
+                    continue
+                # only if the q-panel is unanimous
+                for member in panel:
+                    if opinions[member] != new_opinion:
+                        break
+                else:
+                    opinions[spinson] = new_opinion
+                    changed_events.append(event)
+                    changes.append(2 * new_opinion)
+                continue
+
+            opinions[spinson] = new_opinion
+            changed_events.append(event)
+            changes.append(2 * new_opinion)
+
+        self.operating_opinion[:] = opinions
+
+        deltas = np.zeros(size, dtype=np.int64)
+        deltas[changed_events] = changes
+        sums = self.opinion_sum + np.cumsum(deltas)
+        self.opinion_sum = int(sums[-1]) if size else self.opinion_sum
+        return sums
+
+    def simulate(self, num_of_events: int, p: float, q: int, type_of_influence: str = 'NN',
+                 aggregator: MagnetizationAggregator | None = None,
+                 monitor: ConvergenceMonitor | None = None) -> np.ndarray | MagnetizationAggregator:
+        """ Method simulating the opinion spread: <num_of_events> steps.
+        Args:
+            num_of_events: number of iterations (time).
+            p (flaot): 0 <= p <= 1. Probability for spinson to be independent
+            q (int): number of people in the influence group
+            type_of_influence (str): type of choice of the influence group.
+            aggregator (MagnetizationAggregator | None): if given, magnetization of each block is fed to it instead
+                                                         of being stored (the run is one more replica of it).
+            monitor (ConvergenceMonitor | None): if given, magnetization of each block is fed to it (recorded once
+                                                 per sweep unless its <every> is set) and the simulation stops
+                                                 after the block in which it converged.
+        Returns:
+            (np.array | MagnetizationAggregator): magnetization after each event or the given aggregator
+        """
+        if type_of_influence != 'NN':
+            raise NotImplementedError
+
+        self.reload_operating_opinion()
+        if monitor is not None and monitor.every is None:
+            # once per Monte Carlo sweep - consecutive events are strongly correlated
+            monitor.every = len(self.nodes)
+
+        magnetization = np.empty(num_of_events) if aggregator is None else None
+        for start in range(0, num_of_events, self.block_size):
+            size = min(self.block_size, num_of_events - start)
+            block = self.simulate_block(size, p, q) / len(self.nodes)
+
+            if aggregator is None:
+                magnetization[start:start + size] = block
+            else:
+                aggregator.update(block, start=start)
+
+            if monitor is not None and monitor.update(block):
+                if aggregator is None:
+                    magnetization = magnetization[:start + size]
+                break
+
+        return magnetization if aggregator is None else aggregator
@@ -0,0 +1,82 @@
+from math import comb
+
+import numpy as np
+
+from list_6.models.aggregators import MagnetizationAggregator
+
+
+class MeanFieldQVoter:
+    """ Exact count-based q-voter model on the complete graph (or annealed network, where the q-panel is drawn from
+    all the other spinsons at each event - the same dynamics).
+
+    The state is only the number of up-spins n. In a single event the chosen spinson (up with probability n / N)
+    flips with probability p / 2 + (1 - p) * P(q-panel unanimous against it), where the unanimity probability
+    comes from binomial (panel with repetitions, as in QVoter) or hypergeometric (without repetitions) counts of
+    the N - 1 other spinsons. Each event is O(1) in time and memory, so N is limited only by the float precision.
+
+    Attributes:
+        network_size (int): number of spinsons N.
+        block_size (int): number of random numbers drawn at once. Defaults to 100000.
+        seed (int | None): seed of the random generator.
+    """
+
+    def __init__(self, network_size: int, block_size: int = 100000, seed: int | None = None):
+        self.network_size = network_size
+        self.block_size = block_size
+        self.rng = np.random.default_rng(seed)
+
+    def unanimity_probability(self, opposite: int, q: int, repetition: bool = True) -> float:
+        """ Method returning probability that all q members of the panel drawn from the N - 1 other spinsons are
+            among <opposite> spinsons with the opposite opinion. """
+        others = self.network_size - 1
+        if repetition:
+            return (opposite / others) ** q
+        return comb(opposite, q) / comb(others, q)
+
+    def flip_probabilities(self, up: int, p: float, q: int, repetition: bool = True) -> tuple[float, float]:
+        """ Method returning probabilities that a single event flips an up-spin down and a down-spin up. """
+        n = self.network_size
+        down = n - up
+        up_to_down = up / n * (p / 2 + (1 - p) * self.unanimity_probability(down, q, repetition))
+        down_to_up = down / n * (p / 2 + (1 - p) * self.unanimity_probability(up, q, repetition))
+        return up_to_down, down_to_up
+
+    def simulate(self, num_of_events: int, p: float, q: int, type_of_influence: str = 'NN', repetition: bool = True,
+                 aggregator: MagnetizationAggregator | None = None) -> np.ndarray | MagnetizationAggregator:
+        """ Method simulating the opinion spread: <num_of_events> steps.
+        Args:
+            num_of_events: number of iterations (time).
+            p (flaot): 0 <= p <= 1. Probability for spinson to be independent
+            q (int): number of people in the influence group
+            type_of_influence (str): 'NN' (complete graph) or 'annealed'.
+            repetition (bool): q-panel drawn with repetitions (as in QVoter). Defaults to True.
+            aggregator (MagnetizationAggregator | None): if given, magnetization of each block is fed to it instead
+                                                         of being stored.
+        Returns:
+            (np.array | MagnetizationAggregator): magnetization after each event or the given aggregator
+        """
+        if type_of_influence not in ('NN', 'annealed'):
+            raise NotImplementedError
+
+        n = self.network_size
+        up = n
+        magnetization = np.empty(num_of_events) if aggregator is None else None
+
+        for start in range(0, num_of_events, self.block_size):
+            size = min(self.block_size, num_of_events - start)
+            ups = []
+            for u in self.rng.random(size).tolist():
+                up_to_down, down_to_up = self.flip_probabilities(up, p, q, repetition)
+                if u < up_to_down:
+                    up -= 1
+                elif u < up_to_down + down_to_up:
+                    up += 1
+                ups.append(up)
+
+            block = (2 * np.array(ups, dtype=np.float64) - n) / n
+            if aggregator is None:
+                magnetization[start:start + size] = block
+            else:
+                aggregator.update(block, start=start)
+
+        return magnetization if aggregator is None else aggregator
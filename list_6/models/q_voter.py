@@ -1,22 +1,46 @@
 import networkx as nx
-from copy import copy
 import numpy as np
 
+from list_3.models import ConvergenceMonitor, SharedTopology, count, phase
+
 
 class QVoter:
-    """ q-voter model with NN influence group. """
+    """ q-voter model with NN influence group. The network may be SharedTopology - pickled QVoter (e.g. sent to
+    a worker process) then carries only the name of the shared block instead of the whole graph. """
 
-    def __init__(self, init_network: nx.Graph):
+    def __init__(self, init_network: nx.Graph | SharedTopology):
         self.init_network = init_network
         self.network_size = init_network.size()
+        # positions of the nodes, so a random spinson is drawn in O(1) instead of converting the nodes every event
+        self.nodes = list(init_network.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
 
         self.operating_network = None
         self.operating_opinion = None
         self.operating_magnetization = []
 
+    def __getstate__(self) -> dict:
+        """ Positions and operating state are rebuilt from the network, so QVoter on SharedTopology pickles to the name
+            of the block and the parameters only. """
+        state = self.__dict__.copy()
+        for name in ('nodes', 'node_index', 'operating_network', 'operating_opinion'):
+            state.pop(name)
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self.nodes = list(self.init_network.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        self.operating_network = self.operating_opinion = None
+
+    def cache_key(self) -> nx.Graph | SharedTopology:
+        """ Method returning what the results depend on (besides the arguments), used by DiskCache. """
+        return self.init_network
+
     def reload_operating_network(self):
-        """ Operating network is needed for Monte Carlo trajectories. """
-        self.operating_network = copy(self.init_network)
+        """ Operating network is needed for Monte Carlo trajectories. The network is never modified by the
+            simulation, so it is referenced read-only instead of copied. """
+        self.operating_network = self.init_network
 
     def reload_operating_opinion(self):
         """ Method initializing opinion of the spinsons to 1. In future this could be changed and improved. """
@@ -35,7 +59,15 @@ class QVoter:
         """
         if type_of_influence == 'NN':
             # 'q randomly chosen nearest neighbours of the target spinson are in the group.'
+            count('q_voter.neighbour_lookups')
             return np.random.choice([neighbour for neighbour in self.operating_network.neighbors(spinson)], q)
+        elif type_of_influence == 'annealed':
+            # annealed (mean-field) network: q spinsons drawn with repetitions from all the other spinsons,
+            # MeanFieldQVoter simulates it exactly from the number of up-spins only
+            # positions among the N - 1 others, shifted over the position of the spinson
+            others = np.random.randint(len(self.nodes) - 1, size=q)
+            others[others >= self.node_index[spinson]] += 1
+            return [self.nodes[other] for other in others]
         else:
             # in the future there may be other ways of choice implemented as well
             raise NotImplementedError
@@ -56,10 +88,11 @@ class QVoter:
             type_of_influence (str): type of choice of the influence group.
         """
         # (1) 'pick a spinson at random'
-        spinson = np.random.choice(self.operating_network.nodes, 1)[0]
+        spinson = self.nodes[np.random.randint(len(self.nodes))]
 
         # (2) 'decide with probability p, if the spinson will act as independent
         if np.random.random() < p:
+            count('q_voter.independent')
             # (3) if independent, change it's opinion with probability 1/2
             if np.random.random() < 0.5:
                 opinion = self.operating_opinion[spinson]
@@ -70,25 +103,43 @@ class QVoter:
             # only if the q-panel is unanimous
             if self.unanimous_check(influence_group):
                 self.operating_opinion[spinson] = self.operating_opinion[list(influence_group)[0]]
+            else:
+                count('q_voter.rejected')
             # TODO: there could be also a part from original model, but it's not part of this model:
             #       else: spinson flips it's opinion with probability <eps>.
 
-    def simulate(self, num_of_events: int, p: float, q: int, type_of_influence: str = 'NN'):
+    def simulate(self, num_of_events: int, p: float, q: int, type_of_influence: str = 'NN',
+                 monitor: ConvergenceMonitor | None = None):
         """ Method simulating the opinion spread: <num_of_events> steps.
         Args:
             num_of_events: number of iterations (time).
             p (flaot): 0 <= p <= 1. Probability for spinson to be independent
             q (int): number of people in the influence group
             type_of_influence (str): type of choice of the influence group.
+            monitor (ConvergenceMonitor | None): if given, magnetization is fed to it (recorded once per sweep unless
+                                                 its <every> is set) and the simulation stops early once it is
+                                                 absorbed or equilibrated.
         """
-        self.initialize_simulation()
-
-        for event in range(num_of_events):
-            # single iteration
-            self.single_step(p, q, type_of_influence)
-            # add current magnetization to the list
-            self.update_magnetization_list()
-
+        if type_of_influence == 'annealed' and len(self.nodes) < 2:
+            raise ValueError("annealed influence group needs at least 2 spinsons")
+
+        with phase('q_voter.initialize'):
+            self.initialize_simulation()
+
+        if monitor is not None and monitor.every is None:
+            # once per Monte Carlo sweep - consecutive events are strongly correlated
+            monitor.every = len(self.nodes)
+
+        with phase('q_voter.events'):
+            for event in range(num_of_events):
+                # single iteration
+                self.single_step(p, q, type_of_influence)
+                # add current magnetization to the list
+                self.update_magnetization_list()
+                if monitor is not None and monitor.update(self.operating_magnetization[-1]):
+                    break
+
+        count('q_voter.events', len(self.operating_magnetization))
         return self.operating_magnetization
 
     def calculate_magnetization(self):
@@ -109,6 +160,59 @@ class QVoter:
         self.reload_operating_magnetization()
 
 
+class ArrayQVoter(QVoter):
+    """ q-voter model with NN influence group, opinions stored in int8 array indexed by position of the node in
+    <nodes> and running sum of the opinions. Each flip changes the sum by +-2, so magnetization is O(1) per event.
+    """
+
+    def __init__(self, init_network: nx.Graph | SharedTopology):
+        super().__init__(init_network)
+        self.opinion_sum = 0
+
+    def reload_operating_opinion(self):
+        """ Method initializing opinion of the spinsons to 1. """
+        self.operating_opinion = np.ones(len(self.nodes), dtype=np.int8)
+        self.opinion_sum = len(self.nodes)
+
+    def set_opinion(self, index: int, opinion: int):
+        """ Method setting <opinion> of the spinson of given <index> and updating sum of the opinions. """
+        # python ints - int8 arithmetic would overflow for networks bigger than 127 nodes
+        self.opinion_sum += int(opinion) - int(self.operating_opinion[index])
+        self.operating_opinion[index] = opinion
+
+    def unanimous_check(self, group: list[int]):
+        """ Method checking if the group is unanimous.
+        Args:
+            group (list[int]): Given group"""
+        opinions = self.operating_opinion[[self.node_index[member] for member in group]]
+        return abs(int(opinions.sum())) == len(group)
+
+    def single_step(self, p: float, q: int, type_of_influence: str = 'NN'):
+        """ Single event accroding to the paper (see QVoter.single_step).
+        Args:
+            p (flaot): 0 <= p <= 1. Probability for spinson to be independent
+            q (int): number of people in the influence group
+            type_of_influence (str): type of choice of the influence group.
+        """
+        spinson = self.nodes[np.random.randint(len(self.nodes))]
+        index = self.node_index[spinson]
+
+        if np.random.random() < p:
+            count('q_voter.independent')
+            if np.random.random() < 0.5:
+                self.set_opinion(index, -self.operating_opinion[index])
+        else:
+            influence_group = self.influence_choice(spinson, q, type_of_influence)
+            if self.unanimous_check(influence_group):
+                self.set_opinion(index, self.operating_opinion[self.node_index[influence_group[0]]])
+            else:
+                count('q_voter.rejected')
+
+    def calculate_magnetization(self):
+        """ Method returning magnetization from the running sum of the opinions. """
+        return self.opinion_sum / len(self.nodes)
+
+
 if __name__ == "__main__":
     """ simple check of methods."""
     n = 10
@@ -119,4 +223,5 @@ if __name__ == "__main__":
     q_voter = QVoter(network)
 
     mag = q_voter.simulate(num_of_events=10, p=0.2, q=3)
-    print(mag)
\ No newline at end of file
+    print(mag)
+
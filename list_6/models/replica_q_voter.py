@@ -0,0 +1,101 @@
+import networkx as nx
+import numpy as np
+
+from list_3.models import to_csr
+from list_6.models.aggregators import MagnetizationAggregator
+from list_6.models.fast_q_voter import draw_panels
+
+
+class ReplicaQVoter:
+    """ q-voter model with NN influence group for many independent Monte Carlo runs advanced in lockstep.
+
+    Opinions are held in (replicas, N) int8 matrix. Each vectorized step is one elementary event in every replica:
+    spinsons, coins and q-panels (from CSR adjacency, with repetitions as in QVoter) are drawn for all replicas at
+    once and the unanimity check abs(sum(panel opinions)) == q is an array operation.
+
+    Attributes:
+        init_network (nx.Graph): network of the spinsons.
+        seed (int | None): seed of the random generator.
+    """
+
+    def __init__(self, init_network: nx.Graph, seed: int | None = None):
+        self.init_network = init_network
+        self.rng = np.random.default_rng(seed)
+
+        self.nodes, self.indptr, self.indices = to_csr(init_network)
+        self.degrees = np.diff(self.indptr)
+
+        self.operating_opinion = None
+        self.opinion_sum = None
+
+    def reload_operating_opinion(self, replicas: int):
+        """ Method initializing opinion of the spinsons of all <replicas> to 1. """
+        self.operating_opinion = np.ones((replicas, len(self.nodes)), dtype=np.int8)
+        self.opinion_sum = np.full(replicas, len(self.nodes), dtype=np.int64)
+
+    def single_step(self, p: float, q: int):
+        """ Single event in each of the replicas.
+        Args:
+            p (flaot): 0 <= p <= 1. Probability for spinson to be independent
+            q (int): number of people in the influence group
+        """
+        replicas = len(self.opinion_sum)
+        rows = np.arange(replicas)
+
+        spinsons = self.rng.integers(len(self.nodes), size=replicas)
+        independent = self.rng.random(replicas) < p
+        flip = self.rng.random(replicas) < 0.5
+
+        degrees = self.degrees[spinsons]
+        panels = draw_panels(self.indptr, self.indices, spinsons, q, self.rng)
+
+        current = self.operating_opinion[rows, spinsons]
+        panel_sum = self.operating_opinion[rows[:, None], panels].sum(axis=1, dtype=np.int64)
+        unanimous = ~independent & (degrees > 0) & (np.abs(panel_sum) == q)
+
+        new_opinion = np.where(independent & flip, -current, current)
+        new_opinion = np.where(unanimous, np.sign(panel_sum), new_opinion).astype(np.int8)
+
+        self.opinion_sum += new_opinion.astype(np.int64) - current
+        self.operating_opinion[rows, spinsons] = new_opinion
+
+    def simulate(self, num_of_events: int, p: float, q: int, replicas: int = 100, type_of_influence: str = 'NN',
+                 aggregator: MagnetizationAggregator | None = None,
+                 block_size: int = 1000, every: int = 1) -> np.ndarray | MagnetizationAggregator:
+        """ Method simulating the opinion spread: <num_of_events> steps in each of <replicas> runs.
+        Args:
+            num_of_events: number of iterations (time).
+            p (flaot): 0 <= p <= 1. Probability for spinson to be independent
+            q (int): number of people in the influence group
+            replicas (int): number of Monte Carlo runs. Defaults to 100.
+            type_of_influence (str): type of choice of the influence group.
+            aggregator (MagnetizationAggregator | None): if given, magnetization is fed to it in blocks of
+                                                         <block_size> events instead of being stored.
+            block_size (int): number of events buffered before updating the aggregator. Defaults to 1000.
+            every (int): without aggregator only magnetization after every <every>-th event is stored, e.g. N - once
+                         per Monte Carlo sweep. Defaults to 1.
+        Returns:
+            (np.array | MagnetizationAggregator): (replicas, num_of_events // every) magnetization after events
+                                                  every - 1, 2 * every - 1, ... or the given aggregator
+        """
+        if type_of_influence != 'NN':
+            raise NotImplementedError
+
+        self.reload_operating_opinion(replicas)
+
+        if aggregator is None:
+            magnetization = np.empty((replicas, num_of_events // every))
+            for event in range(num_of_events):
+                self.single_step(p, q)
+                if (event + 1) % every == 0:
+                    magnetization[:, event // every] = self.opinion_sum
+            return magnetization / len(self.nodes)
+
+        buffer = np.empty((replicas, block_size))
+        for start in range(0, num_of_events, block_size):
+            size = min(block_size, num_of_events - start)
+            for event in range(size):
+                self.single_step(p, q)
+                buffer[:, event] = self.opinion_sum
+            aggregator.update(buffer[:, :size] / len(self.nodes), start=start)
+        return aggregator
@@ -0,0 +1,113 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+import networkx as nx
+import numpy as np
+
+from list_6.models.replica_q_voter import ReplicaQVoter
+
+
+@dataclass(frozen=True)
+class GraphSpec:
+    """ Declarative specification of the network of the sweep.
+    Attributes:
+        kind (str): 'BA' (barabasi-albert), 'WS' (watts-strogatz) or 'complete'.
+        n (int): number of nodes.
+        params (tuple): (m,) for BA, (k, beta) for WS, () for complete graph.
+    """
+    kind: str
+    n: int
+    params: tuple = ()
+
+    @property
+    def name(self) -> str:
+        """ name of the graph in the notebook convention, e.g. 'BA(100,4)', 'WS(100,4,0.01)'. """
+        if self.kind == 'complete':
+            return f'complete-graph({self.n})'
+        return f'{self.kind}({",".join(map(str, (self.n,) + tuple(self.params)))})'
+
+    def build(self, seed: int | None = None) -> nx.Graph:
+        """ method generating the graph. """
+        if self.kind == 'BA':
+            return nx.barabasi_albert_graph(self.n, *self.params, seed=seed)
+        elif self.kind == 'WS':
+            return nx.watts_strogatz_graph(self.n, *self.params, seed=seed)
+        elif self.kind == 'complete':
+            return nx.complete_graph(self.n)
+        raise ValueError(f"unknown kind of graph: {self.kind}")
+
+
+def cell_path(store: str, graph: GraphSpec, q: int, p: float) -> str:
+    """ function returning path of the file of a single (graph, q, p) cell of the sweep. """
+    return os.path.join(store, f'{graph.name}_q{q}_p{p:.6f}.npz')
+
+
+def _run_cell(graph: GraphSpec, graph_seed: int, q: int, p: float, num_of_events: int, replicas: int,
+              seed: np.random.SeedSequence, path: str) -> str:
+    """ function simulating a single cell of the sweep and saving it to <path> (worker of run_sweep). """
+    network = graph.build(seed=graph_seed)
+    magnetization = ReplicaQVoter(network, seed=seed).simulate(num_of_events, p, q, replicas=replicas)
+
+    # written under temporary name and renamed, so interrupted cells are never taken as finished
+    temporary_path = f'{path}.tmp.npz'
+    np.savez(temporary_path, graph_name=graph.name, q=q, p=p, replicas=replicas,
+             avg_magnetization_over_time=magnetization.mean(axis=0))
+    os.replace(temporary_path, path)
+    return path
+
+
+def run_sweep(graphs: list[GraphSpec], q: list[int], p: list[float], store: str, num_of_events: int = 1000,
+              replicas: int = 100, processes: int | None = None, seed: int = 0) -> list[str]:
+    """ function running q-voter simulations for every (graph, q, p) cell of the grid on a process pool. Each
+        finished cell is saved straight away to <store> as .npz file, cells already present in <store> are skipped,
+        so an interrupted sweep can be resumed by calling the function again.
+
+        Seeding is deterministic: every graph is generated from SeedSequence(seed, spawn_key=(graph index,)) (the
+        same network for all its cells, as in the notebook), every cell is simulated with
+        SeedSequence(seed, spawn_key=(graph index, q index, p index)).
+    Args:
+        graphs (list[GraphSpec]): networks of the sweep.
+        q (list[int]): sizes of the influence group.
+        p (list[float]): probabilities of independence.
+        store (str): folder of the results.
+        num_of_events (int): number of events of each run. Defaults to 1000.
+        replicas (int): number of Monte Carlo runs of each cell. Defaults to 100.
+        processes (int | None): number of worker processes. Defaults to None, i.e. os.cpu_count().
+        seed (int): seed of the sweep. Defaults to 0.
+    Returns:
+        (list[str]): paths of all the cells (computed now or before).
+    """
+    os.makedirs(store, exist_ok=True)
+
+    cells = []
+    for (i, graph), (j, q_i), (k, p_k) in itertools.product(enumerate(graphs), enumerate(q), enumerate(p)):
+        path = cell_path(store, graph, q_i, p_k)
+        if os.path.exists(path):
+            continue
+        graph_seed = int(np.random.SeedSequence(seed, spawn_key=(i,)).generate_state(1)[0])
+        cells.append((graph, graph_seed, q_i, p_k, num_of_events, replicas,
+                      np.random.SeedSequence(seed, spawn_key=(i, j, k)), path))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(_run_cell, *cell) for cell in cells]
+        for future in as_completed(futures):
+            # re-raise exceptions of the workers
+            future.result()
+
+    return [cell_path(store, graph, q_i, p_k) for graph, q_i, p_k in itertools.product(graphs, q, p)]
+
+
+def load_sweep(store: str):
+    """ function loading all the cells from <store> to pandas.DataFrame with columns graph_name, q, p,
+        avg_magnetization_over_time (the same as all_data in the notebook). """
+    import pandas as pd
+
+    rows = []
+    for filename in sorted(os.listdir(store)):
+        if filename.endswith('.npz') and '.tmp' not in filename:
+            with np.load(os.path.join(store, filename)) as cell:
+                rows.append((str(cell['graph_name']), int(cell['q']), float(cell['p']),
+                             cell['avg_magnetization_over_time']))
+    return pd.DataFrame(rows, columns=['graph_name', 'q', 'p', 'avg_magnetization_over_time'])